@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: `sanitize_text` vs the previous `strip_source_site_urls(norm_space(text))`
+chain used for description/about fields in the importer.
+
+Texts come from the real catalog (`--jsonl`, description + about) and/or the source DB
+(`--info-db`, excerpt + about); without either, synthetic texts of typical lengths are used.
+Results are grouped by text length.
+
+Typical usage (from repo root):
+  python3 biznes.lucheestiy.com/app/scripts/bench_text_sanitizer.py --jsonl biznes.lucheestiy.com/app/public/data/biznes/companies.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from import_info_db_into_biznes import (  # noqa: E402
+    SOURCE_SITE_DOMAIN,
+    TextPolicy,
+    norm_space,
+    sanitize_text,
+)
+
+_LEGACY_URL_RE = re.compile(r"https?://[^\s]*" + re.escape(SOURCE_SITE_DOMAIN) + r"[^\s]*", flags=re.IGNORECASE)
+_LEGACY_BARE_RE = re.compile(r"(?:www\.)?" + re.escape(SOURCE_SITE_DOMAIN) + r"(?:/[^\s]*)?", flags=re.IGNORECASE)
+
+# Same cleaning as the legacy chain, so outputs can be compared one to one.
+_COMPARABLE_POLICY = TextPolicy(strip_control_chars=False, max_chars=None)
+
+LENGTH_BUCKETS = [(0, 256), (256, 1024), (1024, 4096), (4096, 16384), (16384, 10**9)]
+
+
+def legacy_clean(text: str) -> str:
+    text = norm_space(text)
+    if not text:
+        return ""
+    text = _LEGACY_URL_RE.sub("", text)
+    text = _LEGACY_BARE_RE.sub("", text)
+    return norm_space(text)
+
+
+def texts_from_jsonl(path: Path, limit: int) -> list[str]:
+    out: list[str] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            for field in ("description", "about"):
+                value = obj.get(field)
+                if isinstance(value, str) and value:
+                    out.append(value)
+            if len(out) >= limit:
+                break
+    return out[:limit]
+
+
+def texts_from_info_db(path: Path, limit: int) -> list[str]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        out: list[str] = []
+        for excerpt, about in conn.execute("SELECT excerpt, about FROM companies WHERE status='done' LIMIT ?", (limit,)):
+            out.extend(v for v in (excerpt, about) if v)
+        return out[:limit]
+    finally:
+        conn.close()
+
+
+def synthetic_texts(limit: int) -> list[str]:
+    rnd = random.Random(0)
+    words = "Компания оказывает услуги грузоперевозки по Беларуси и СНГ склад логистика доставка".split()
+    out: list[str] = []
+    for i in range(limit):
+        n = rnd.choice([20, 80, 300, 900, 3000])
+        parts = [rnd.choice(words) + ("\n\t " if rnd.random() < 0.05 else "") for _ in range(n)]
+        if i % 10 == 0:
+            parts.insert(rnd.randrange(len(parts)), f"https://www.{SOURCE_SITE_DOMAIN}/ru/company/x.html")
+        out.append(" ".join(parts))
+    return out
+
+
+def time_per_call(fn, texts: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - start)
+    return best / max(1, len(texts))
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Benchmark the importer's text sanitizer on real description lengths")
+    p.add_argument("--jsonl", default="", help="Catalog companies.jsonl to take description/about texts from")
+    p.add_argument("--info-db", default="", help="Source SQLite DB to take excerpt/about texts from")
+    p.add_argument("--limit", type=int, default=20000, help="Max texts to load per source")
+    p.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = p.parse_args()
+
+    texts: list[str] = []
+    if args.jsonl:
+        texts += texts_from_jsonl(Path(args.jsonl), args.limit)
+    if args.info_db:
+        texts += texts_from_info_db(Path(args.info_db), args.limit)
+    if not texts:
+        texts = synthetic_texts(min(args.limit, 5000))
+        print("No --jsonl/--info-db given: using synthetic texts")
+
+    mismatches = sum(1 for t in texts if legacy_clean(t) != sanitize_text(t, _COMPARABLE_POLICY))
+    print(f"Texts: {len(texts)}; outputs differing from legacy chain: {mismatches}")
+
+    print(f"{'length':>14} {'texts':>7} {'legacy us':>10} {'new us':>8} {'speedup':>8}")
+    total_legacy = total_new = 0.0
+    for lo, hi in LENGTH_BUCKETS:
+        bucket = [t for t in texts if lo <= len(t) < hi]
+        if not bucket:
+            continue
+        legacy = time_per_call(legacy_clean, bucket, args.repeat)
+        new = time_per_call(lambda t: sanitize_text(t, _COMPARABLE_POLICY), bucket, args.repeat)
+        total_legacy += legacy * len(bucket)
+        total_new += new * len(bucket)
+        label = f"{lo}-{hi if hi < 10**9 else ''}"
+        print(f"{label:>14} {len(bucket):>7} {legacy * 1e6:>10.2f} {new * 1e6:>8.2f} {legacy / new:>7.2f}x")
+    print(f"{'all':>14} {len(texts):>7} {'':>10} {'':>8} {total_legacy / total_new:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,11 @@ Key behavior:
 - Maps source rubric/category into the existing Biznes category structure (slugs used by the site).
 - Skips duplicates (conservative): phone OR email OR corporate domain OR exact (name+address) match.
 - Removes source-site links from public fields (websites + source_url).
+- Emits catalog sidecars next to the JSONL: `<stem>.postings.bin` (delta/varint company
+  ordinals per category/rubric/region) and `<stem>.facets.json` (facet counts, default
+  sort order, line offsets), so catalog/rubric pages can slice instead of scanning.
+- Serializes concurrent runs with an `fcntl` lock; `--keep-generations N` publishes each run into
+  a generation directory behind an atomically flipped `current` symlink (`--rollback` reverts).
 
 Typical usage (from repo root):
   python3 biznes.lucheestiy.com/app/scripts/import_info_db_into_biznes.py --in-place
@@ -16,15 +21,20 @@ Typical usage (from repo root):
 from __future__ import annotations
 
 import argparse
+import fcntl
+import itertools
 import json
+import math
 import os
 import re
+import shutil
 import sqlite3
+import unicodedata
 from collections import Counter, defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import IO, Any, Iterable
 from urllib.parse import unquote, urlparse
 
 
@@ -101,6 +111,34 @@ def norm_text(value: str) -> str:
     return norm_space(value).casefold()
 
 
+# Belarusian/Ukrainian letters sort right after the Russian letter they follow.
+_CYRILLIC_EXTRA_AFTER = {"ґ": "г", "є": "е", "і": "и", "ї": "и", "ў": "у"}
+
+
+def ru_collation_key(value: str) -> tuple[tuple[int, int, int], ...]:
+    """
+    Approximates `a.localeCompare(b, "ru", { sensitivity: "base" })` used by store.ts:
+    case-insensitive, `ё` = `е`, Latin accents ignored, and spaces < punctuation/symbols
+    < digits < Cyrillic < Latin.
+    """
+    key: list[tuple[int, int, int]] = []
+    for ch in unicodedata.normalize("NFC", norm_text(value).replace("ё", "е")):
+        if ch.isspace():
+            key.append((0, 0, 0))
+        elif ch.isdigit():
+            key.append((2, ord(ch), 0))
+        elif "а" <= ch <= "я":
+            key.append((3, ord(ch), 0))
+        elif ch in _CYRILLIC_EXTRA_AFTER:
+            key.append((3, ord(_CYRILLIC_EXTRA_AFTER[ch]), 1))
+        elif ch.isalpha():
+            base = unicodedata.normalize("NFD", ch)[0]
+            key.append((4 if base.isascii() else 5, ord(base), 0))
+        else:
+            key.append((1, ord(ch), 0))
+    return tuple(key)
+
+
 def uniq_keep_order(values: Iterable[str]) -> list[str]:
     out: list[str] = []
     seen: set[str] = set()
@@ -115,12 +153,31 @@ def uniq_keep_order(values: Iterable[str]) -> list[str]:
     return out
 
 
-def normalize_phone(raw: str) -> str:
-    digits = "".join(re.findall(r"\d+", raw or ""))
-    # Belarus phones tend to be "375..." when present; keep as-is otherwise.
+# Separators seen in phone columns; deleting them with str.translate leaves plain digits
+# for almost every value, so the regex fallback only runs on unusual input.
+_PHONE_SEPARATORS = str.maketrans("", "", " \t\u00a0()+-./\u2010\u2011\u2012\u2013\u2014")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def canonicalize_belarus_phone(digits: str) -> str:
+    """
+    Brings Belarus numbers to the international "375..." form so the same phone written
+    as "8 029 ..." (domestic long-distance) or "00375 ..." produces one dedupe key.
+    """
+    if digits.startswith("00375"):
+        return digits[2:]
+    if len(digits) == 11 and digits.startswith("80"):
+        return "375" + digits[2:]
     return digits
 
 
+def normalize_phone(raw: str) -> str:
+    s = (raw or "").translate(_PHONE_SEPARATORS)
+    if not (s.isascii() and s.isdigit()):
+        s = "".join(_DIGITS_RE.findall(s))
+    return canonicalize_belarus_phone(s)
+
+
 def normalize_email(raw: str) -> str:
     return (raw or "").strip().casefold()
 
@@ -170,6 +227,50 @@ def is_ignored_domain(host: str) -> bool:
     return False
 
 
+# Batch variants: take a whole column for a chunk of companies and return keys in the
+# same order. Repeated values (shared domains, office phones/emails) are normalized once per batch.
+
+
+def normalize_phones(values: Iterable[str]) -> list[str]:
+    cache: dict[str, str] = {}
+    out: list[str] = []
+    for v in values:
+        phone = cache.get(v)
+        if phone is None:
+            phone = cache[v] = normalize_phone(v)
+        out.append(phone)
+    return out
+
+
+def normalize_emails(values: Iterable[str]) -> list[str]:
+    cache: dict[str, str] = {}
+    out: list[str] = []
+    for v in values:
+        email = cache.get(v)
+        if email is None:
+            email = cache[v] = (v or "").strip().casefold()
+        out.append(email)
+    return out
+
+
+def dedupe_domains(values: Iterable[str]) -> list[str]:
+    """
+    Returns the dedupe domain for each website, or "" when the host is empty,
+    shared (`IGNORED_DOMAINS`) or the source site.
+    """
+    cache: dict[str, str] = {}
+    out: list[str] = []
+    for v in values:
+        host = cache.get(v)
+        if host is None:
+            host = normalize_domain(v)
+            if not host or is_ignored_domain(host) or is_source_site_link(v):
+                host = ""
+            cache[v] = host
+        out.append(host)
+    return out
+
+
 _RU_TRANSLIT = {
     "а": "a",
     "б": "b",
@@ -260,6 +361,262 @@ def extract_city(address: str) -> str:
     return city
 
 
+# Mirrors POSTAL_PREFIX_TO_REGION_SLUG in src/lib/biznes/store.ts; keep in sync.
+POSTAL_PREFIX_TO_REGION_SLUG: dict[str, str] = {
+    # Canonical Belarus postal prefixes
+    "210": "vitebsk",
+    "211": "vitebsk",
+    "212": "mogilev",
+    "213": "mogilev",
+    "220": "minsk",
+    "221": "minsk-region",
+    "222": "minsk-region",
+    "223": "minsk-region",
+    "224": "brest",
+    "225": "brest",
+    "230": "grodno",
+    "231": "grodno",
+    "246": "gomel",
+    "247": "gomel",
+    # Rare "corrupted" prefixes observed in current dataset exports
+    "200": "minsk",
+    "201": "vitebsk",
+    "202": "minsk-region",
+    "215": "minsk",
+    "217": "vitebsk",
+    "227": "minsk-region",
+    "232": "minsk",
+    "234": "grodno",
+    "236": "gomel",
+    "249": "vitebsk",
+    "264": "gomel",
+    "270": "minsk",
+    "274": "gomel",
+}
+
+_POSTAL_CODE_RE = re.compile(r"\b2\d{5}\b")
+_MINSK_DISTRICT_RE = re.compile(r"минск(?:ий|ого|ому|ом)?\s*(?:р-н|район)", flags=re.IGNORECASE)
+_MINSK_OBLAST_RE = re.compile(r"минск(?:ая|ой|ую|ом)?\s*(?:обл\.?|область)", flags=re.IGNORECASE)
+
+
+def region_slug_from_postal_code(address: str) -> str:
+    for code in _POSTAL_CODE_RE.findall(address or ""):
+        region_slug = POSTAL_PREFIX_TO_REGION_SLUG.get(code[:3])
+        if region_slug:
+            return region_slug
+    return ""
+
+
+def normalize_region_slug(city: str, region: str, address: str) -> str:
+    """
+    Python port of normalizeRegionSlug() from src/lib/biznes/store.ts, so facet counts
+    computed by the importer match what the site computes at startup. Returns "" if unknown.
+    """
+    city_low = (city or "").lower()
+    region_low = (region or "").lower()
+    address_low = (address or "").lower()
+
+    for low in (region_low, city_low):
+        if "брест" in low:
+            return "brest"
+        if "витеб" in low:
+            return "vitebsk"
+        if "гомел" in low:
+            return "gomel"
+        if "гродн" in low:
+            return "grodno"
+        if "могил" in low:
+            return "mogilev"
+
+    def looks_like_district(s: str) -> bool:
+        return any(k in s for k in ("р-н", "район", "обл", "область"))
+
+    is_minsk_region = (
+        any(rx.search(s) for rx in (_MINSK_DISTRICT_RE, _MINSK_OBLAST_RE) for s in (city_low, region_low, address_low))
+        or ("минск" in city_low and looks_like_district(city_low))
+        or ("минск" in region_low and looks_like_district(region_low))
+    )
+    if is_minsk_region:
+        return "minsk-region"
+
+    from_postal = region_slug_from_postal_code(address)
+    if from_postal:
+        return from_postal
+
+    if "минск" in city_low or "минск" in region_low:
+        return "minsk"
+    return ""
+
+
+_POSTAL_PREFIX_RE = re.compile(r"^\s*2\d{5}\s*[,;]?\s*")
+_SETTLEMENT_PREFIX_RE = re.compile(
+    r"^(?:г\.\s*п\.|гп\.?|г\.|город|аг\.?|агрогородок|д\.|деревня|п\.|пос\.|поселок|посёлок|с\.|село)\s*",
+    flags=re.IGNORECASE,
+)
+# Abbreviations may be glued to the name after their dot ("ул.Советская"); bare words need a space.
+_STREET_TYPE_RE = re.compile(
+    r"(?:^|(?<=\s))(?:"
+    r"(?:ул|просп|пр-т|пр-кт|пр|пер|б-р|пл|ш|наб|пр-д|туп|мкр-н|мкр)\."
+    r"|(?:ул|улица|пр-т|пр-кт|просп|проспект|пер|переулок|б-р|бульвар|пл|площадь|ш|шоссе|тракт|наб|набережная|"
+    r"пр-д|проезд|туп|тупик|мкр|мкр-н|микрорайон)(?=\s|$)"
+    r")",
+    flags=re.IGNORECASE,
+)
+_HOUSE_WORDS = r"(?:д|дом|корп|к|кв|оф|офис|стр|пом|ком|эт)"
+# House/building tail after the street name: "95", "5а", "д. 5", "10/2", "95 корп. 2".
+_HOUSE_TAIL_RE = re.compile(
+    r"(?:[\s,]+(?:" + _HOUSE_WORDS + r"\.?\s*)?\d+(?:\s?[а-я](?![а-я]))?(?:[/-]\d+[а-я]?)?)+\s*$",
+    flags=re.IGNORECASE,
+)
+# A whole address part that is only a house/building reference: "10", "5а", "10/2", "д. 5", "95 корп. 2".
+_HOUSE_PART_RE = re.compile(
+    r"^(?:" + _HOUSE_WORDS + r"\.?\s*)?\d+(?:\s?[а-я](?![а-я]))?(?:[/-]\d+[а-я]?)?(?=[\s,]|$)",
+    flags=re.IGNORECASE,
+)
+
+
+def normalize_place_name(value: str) -> str:
+    s = norm_text(value).replace("ё", "е")
+    s = _SETTLEMENT_PREFIX_RE.sub("", s)
+    return norm_space(s.replace(".", " ").replace('"', " ").replace("«", " ").replace("»", " "))
+
+
+def normalize_street_name(value: str) -> str:
+    s = norm_text(value).replace("ё", "е")
+    s = _STREET_TYPE_RE.sub(" ", f" {s} ")
+    s = _HOUSE_TAIL_RE.sub("", s)
+    return norm_space(s.replace(".", " ").replace('"', " ").replace("«", " ").replace("»", " "))
+
+
+def parse_address_parts(address: str) -> tuple[list[str], list[str]]:
+    """
+    Splits a Belarus address into (settlement candidates, street candidates), both normalized.
+    Example: "220030, г. Минск, ул. Ленина, 5" -> (["минск", ...], ["ленина"]);
+    house numbers are dropped ("пр-т Независимости 95" -> "независимости").
+    """
+    s = _POSTAL_PREFIX_RE.sub("", norm_space(address))
+    places: list[str] = []
+    streets: list[str] = []
+    city = extract_city(address)
+    if city and not _STREET_TYPE_RE.search(f" {city.casefold()} "):
+        places.append(normalize_place_name(city))
+    for part in s.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        # Street check first: ordinal names ("1-й пер. Садовый") start with a digit too.
+        if _STREET_TYPE_RE.search(f" {part.casefold()} "):
+            street = normalize_street_name(part)
+            if street:
+                streets.append(street)
+        elif _HOUSE_PART_RE.match(part):
+            continue
+        else:
+            place = normalize_place_name(part)
+            if place and place not in places:
+                places.append(place)
+    return places, streets
+
+
+@dataclass
+class Gazetteer:
+    """
+    Offline place lookup loaded from a TSV file with a header row and columns
+    `city`, `street`, `lat`, `lng` (an empty `street` is the settlement centroid).
+    Extra columns are ignored; lines starting with `#` are comments.
+    """
+
+    cities: dict[str, tuple[float, float]]
+    streets: dict[tuple[str, str], tuple[float, float]]
+
+    @classmethod
+    def load(cls, path: Path) -> Gazetteer:
+        cities: dict[str, tuple[float, float]] = {}
+        streets: dict[tuple[str, str], tuple[float, float]] = {}
+        with path.open("r", encoding="utf-8") as f:
+            header: list[str] | None = None
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                cols = line.rstrip("\n").split("\t")
+                if header is None:
+                    header = [c.strip().casefold() for c in cols]
+                    missing = {"city", "street", "lat", "lng"} - set(header)
+                    if missing:
+                        raise ValueError(f"Gazetteer {path} is missing columns: {', '.join(sorted(missing))}")
+                    continue
+                row = dict(zip(header, cols))
+                try:
+                    point = (float(row["lat"]), float(row["lng"]))
+                except (KeyError, ValueError):
+                    continue
+                city = normalize_place_name(row.get("city") or "")
+                street = normalize_street_name(row.get("street") or "")
+                if not city:
+                    continue
+                if street:
+                    streets.setdefault((city, street), point)
+                else:
+                    cities.setdefault(city, point)
+        return cls(cities=cities, streets=streets)
+
+
+class Geocoder:
+    """
+    Resolves addresses against a `Gazetteer`: street within settlement first, then
+    (optionally) the settlement centroid. Results are cached by normalized address;
+    `stats` counts the outcome of every call, with `cache_hit` as an extra counter.
+    """
+
+    def __init__(self, gazetteer: Gazetteer, *, city_fallback: bool = False) -> None:
+        self.gazetteer = gazetteer
+        self.city_fallback = city_fallback
+        self.cache: dict[str, tuple[float, float, str] | None] = {}
+        self.stats: Counter[str] = Counter()
+
+    def geocode(self, address: str) -> tuple[float, float, str] | None:
+        """
+        Returns (lat, lng, precision) with precision "street" or "city", or None.
+        """
+        key = norm_text(_POSTAL_PREFIX_RE.sub("", norm_space(address)))
+        if key in self.cache:
+            result = self.cache[key]
+            self.stats["cache_hit"] += 1
+            self.stats[result[2] if result else "unresolved"] += 1
+            return result
+
+        result: tuple[float, float, str] | None = None
+        places, streets = parse_address_parts(address)
+        for place in places:
+            for street in streets:
+                point = self.gazetteer.streets.get((place, street))
+                if point:
+                    result = (point[0], point[1], "street")
+                    break
+            if result:
+                break
+        if result is None and self.city_fallback:
+            for place in places:
+                point = self.gazetteer.cities.get(place)
+                if point:
+                    result = (point[0], point[1], "city")
+                    break
+
+        self.cache[key] = result
+        self.stats[result[2] if result else "unresolved"] += 1
+        return result
+
+    def apply(self, obj: dict[str, Any]) -> bool:
+        extra = obj.get("extra") if isinstance(obj.get("extra"), dict) else {}
+        if extra.get("lat") is not None and extra.get("lng") is not None:
+            return False
+        found = self.geocode(obj.get("address") or "")
+        if not found:
+            return False
+        obj["extra"] = {**extra, "lat": found[0], "lng": found[1]}
+        return True
+
+
 def choose_target_category_slug(source_category: str, rubric_name: str) -> str:
     base = INFO_DB_CATEGORY_TO_BIZNES_CATEGORY.get(source_category, "uslugi-dlya-naseleniya")
     name = norm_text(rubric_name)
@@ -337,7 +694,13 @@ class RubricRef:
     category_name: str
 
 
-def load_existing_catalog(jsonl_path: Path) -> tuple[list[dict[str, Any]], dict[str, CategoryRef], dict[str, RubricRef], dict[str, list[str]]]:
+def load_existing_catalog(
+    jsonl_path: Path, *, sanitize: bool = True
+) -> tuple[list[dict[str, Any]], dict[str, CategoryRef], dict[str, RubricRef], dict[str, list[str]]]:
+    """
+    `sanitize=False` skips rewriting description/about text; dry runs never write kept
+    companies back, so only their dedupe keys and taxonomy matter.
+    """
     kept: list[dict[str, Any]] = []
     categories_by_slug: dict[str, CategoryRef] = {}
     rubrics_by_slug: dict[str, RubricRef] = {}
@@ -361,9 +724,9 @@ def load_existing_catalog(jsonl_path: Path) -> tuple[list[dict[str, Any]], dict[
             obj["websites"] = clean_websites(obj.get("websites") or [])
             if is_source_site_link(obj.get("source_url") or ""):
                 obj["source_url"] = ""
-            if "description" in obj:
+            if sanitize and "description" in obj:
                 obj["description"] = strip_source_site_urls(str(obj.get("description") or ""))
-            if "about" in obj:
+            if sanitize and "about" in obj:
                 obj["about"] = strip_source_site_urls(str(obj.get("about") or ""))
 
             kept.append(obj)
@@ -401,40 +764,116 @@ def load_existing_catalog(jsonl_path: Path) -> tuple[list[dict[str, Any]], dict[
     return kept, categories_by_slug, rubrics_by_slug, rubric_slugs_by_norm_name
 
 
-def build_dedupe_sets(companies: list[dict[str, Any]]) -> tuple[set[str], set[str], set[str], set[str]]:
-    phones: set[str] = set()
-    emails: set[str] = set()
-    domains: set[str] = set()
-    name_addr: set[str] = set()
+DEDUPE_BATCH_SIZE = 5000
+
 
+@dataclass(frozen=True)
+class DedupeKeys:
+    phones: tuple[str, ...]
+    emails: tuple[str, ...]
+    domains: tuple[str, ...]
+    name_address: str
+
+
+def _split_column(keys: list[str], lengths: list[int], keep: Any) -> list[tuple[str, ...]]:
+    out: list[tuple[str, ...]] = []
+    pos = 0
+    for n in lengths:
+        out.append(tuple(k for k in keys[pos : pos + n] if keep(k)))
+        pos += n
+    return out
+
+
+def company_dedupe_keys(companies: list[dict[str, Any]]) -> list[DedupeKeys]:
+    """
+    Computes dedupe keys for a batch of companies: phones/emails/websites are flattened
+    into one column each, normalized in one call and split back per company.
+    """
+    columns: dict[str, list[str]] = {"phones": [], "emails": [], "websites": []}
+    lengths: dict[str, list[int]] = {"phones": [], "emails": [], "websites": []}
     for obj in companies:
-        for p in obj.get("phones") or []:
-            np = normalize_phone(p)
-            if len(np) >= 9:
-                phones.add(np)
-        for e in obj.get("emails") or []:
-            ne = normalize_email(e)
-            if ne:
-                emails.add(ne)
-        for w in obj.get("websites") or []:
-            host = normalize_domain(w)
-            if not host or is_ignored_domain(host) or is_source_site_link(w):
-                continue
-            domains.add(host)
+        for field, column in columns.items():
+            values = obj.get(field) or []
+            column.extend(values)
+            lengths[field].append(len(values))
+
+    phones = _split_column(normalize_phones(columns["phones"]), lengths["phones"], lambda k: len(k) >= 9)
+    emails = _split_column(normalize_emails(columns["emails"]), lengths["emails"], bool)
+    domains = _split_column(dedupe_domains(columns["websites"]), lengths["websites"], bool)
 
+    out: list[DedupeKeys] = []
+    for i, obj in enumerate(companies):
         n = norm_text(obj.get("name") or "")
         a = norm_text(obj.get("address") or "")
-        if n and a:
-            name_addr.add(f"{n}||{a}")
+        out.append(DedupeKeys(phones[i], emails[i], domains[i], f"{n}||{a}" if n and a else ""))
+    return out
+
+
+DedupeIndex = dict[str, str]  # dedupe key -> source_id of the first company that has it
+
+
+def add_dedupe_keys(
+    index: tuple[DedupeIndex, DedupeIndex, DedupeIndex, DedupeIndex], keys: DedupeKeys, source_id: str
+) -> None:
+    phones, emails, domains, name_addr = index
+    for k in keys.phones:
+        phones.setdefault(k, source_id)
+    for k in keys.emails:
+        emails.setdefault(k, source_id)
+    for k in keys.domains:
+        domains.setdefault(k, source_id)
+    if keys.name_address:
+        name_addr.setdefault(keys.name_address, source_id)
+
+
+def find_dedupe_match(keys: Iterable[str], *indexes: DedupeIndex) -> tuple[str, str]:
+    """
+    Returns (matching key, source_id it belongs to) for the first key found, else ("", "").
+    """
+    for k in keys:
+        for index in indexes:
+            if k in index:
+                return k, index[k]
+    return "", ""
+
+
+def build_dedupe_sets(companies: list[dict[str, Any]]) -> tuple[DedupeIndex, DedupeIndex, DedupeIndex, DedupeIndex]:
+    index: tuple[DedupeIndex, DedupeIndex, DedupeIndex, DedupeIndex] = ({}, {}, {}, {})
+
+    for start in range(0, len(companies), DEDUPE_BATCH_SIZE):
+        chunk = companies[start : start + DEDUPE_BATCH_SIZE]
+        for obj, keys in zip(chunk, company_dedupe_keys(chunk)):
+            add_dedupe_keys(index, keys, str(obj.get("source_id") or "").strip())
+
+    return index
+
+
+# Stays below SQLITE_MAX_VARIABLE_NUMBER on old SQLite builds (999).
+_SQL_IN_CHUNK = 500
 
-    return phones, emails, domains, name_addr
+
+def _iter_company_rubric_rows(conn: sqlite3.Connection, company_ids: list[int] | None) -> Iterable[tuple[Any, ...]]:
+    if company_ids is None:
+        yield from conn.execute(
+            "SELECT company_id, rubric_name, rubric_url FROM company_rubrics ORDER BY company_id, rubric_name"
+        )
+        return
+    for start in range(0, len(company_ids), _SQL_IN_CHUNK):
+        chunk = company_ids[start : start + _SQL_IN_CHUNK]
+        yield from conn.execute(
+            f"SELECT company_id, rubric_name, rubric_url FROM company_rubrics WHERE company_id IN ({','.join('?' * len(chunk))}) ORDER BY company_id, rubric_name",
+            chunk,
+        )
 
 
-def load_source_site_rubrics(conn: sqlite3.Connection) -> dict[int, list[tuple[str, str]]]:
+def load_source_site_rubrics(
+    conn: sqlite3.Connection, company_ids: list[int] | None = None
+) -> dict[int, list[tuple[str, str]]]:
+    """
+    Loads rubrics for all companies, or only for `company_ids` (preview runs).
+    """
     rubrics_by_company: dict[int, list[tuple[str, str]]] = defaultdict(list)
-    for row in conn.execute(
-        "SELECT company_id, rubric_name, rubric_url FROM company_rubrics ORDER BY company_id, rubric_name"
-    ):
+    for row in _iter_company_rubric_rows(conn, company_ids):
         try:
             company_id = int(row[0])
         except Exception:
@@ -464,22 +903,74 @@ def clean_websites(raw_list: list[str]) -> list[str]:
     return uniq_keep_order(out)
 
 
-_SOURCE_SITE_URL_RE = re.compile(
-    r"https?://[^\s]*" + re.escape(SOURCE_SITE_DOMAIN) + r"[^\s]*",
-    flags=re.IGNORECASE,
-)
-_SOURCE_SITE_BARE_RE = re.compile(
-    r"(?:www\.)?" + re.escape(SOURCE_SITE_DOMAIN) + r"(?:/[^\s]*)?",
-    flags=re.IGNORECASE,
+@dataclass(frozen=True)
+class TextPolicy:
+    """
+    What `sanitize_text` does to a long text field. Whitespace is always collapsed.
+    """
+
+    strip_source_links: bool = True
+    # C0 controls and DEL that are not whitespace (\t, \n, \r, ... are collapsed instead).
+    strip_control_chars: bool = True
+    # Truncate to at most this many characters (ellipsis included), preferring a word boundary.
+    max_chars: int | None = None
+    ellipsis: str = "…"
+
+
+SOURCE_LINKS_POLICY = TextPolicy(strip_control_chars=False)
+DESCRIPTION_POLICY = TextPolicy(max_chars=2000)
+ABOUT_POLICY = TextPolicy(max_chars=20000)
+
+_SOURCE_SITE_LINK_PATTERN = (
+    r"https?://[^\s]*" + re.escape(SOURCE_SITE_DOMAIN) + r"[^\s]*"
+    r"|(?:www\.)?" + re.escape(SOURCE_SITE_DOMAIN) + r"(?:/[^\s]*)?"
 )
+_CONTROL_CHARS_PATTERN = r"[\x00-\x08\x0e-\x1b\x7f]+"
+
+# Cheap gates: a literal domain search and a control-char class scan are much faster than
+# the full alternation below, and most texts contain neither.
+_SOURCE_SITE_HINT_RE = re.compile(re.escape(SOURCE_SITE_DOMAIN), flags=re.IGNORECASE)
+_CONTROL_CHARS_RE = re.compile(_CONTROL_CHARS_PATTERN)
+_DROP_RE_BY_POLICY: dict[tuple[bool, bool], re.Pattern[str]] = {
+    (True, True): re.compile(_SOURCE_SITE_LINK_PATTERN + "|" + _CONTROL_CHARS_PATTERN, flags=re.IGNORECASE),
+    (True, False): re.compile(_SOURCE_SITE_LINK_PATTERN, flags=re.IGNORECASE),
+    (False, True): _CONTROL_CHARS_RE,
+}
 
 
-def strip_source_site_urls(text: str) -> str:
+def truncate_text(text: str, max_chars: int, ellipsis: str = "…") -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max(0, max_chars - len(ellipsis))]
+    # Back off to the last space unless that would drop more than a fifth of the budget.
+    space = cut.rfind(" ")
+    if space >= max_chars * 4 // 5:
+        cut = cut[:space]
+    return cut.rstrip(" ,;:-") + ellipsis
+
+
+def sanitize_text(text: str, policy: TextPolicy = DESCRIPTION_POLICY) -> str:
+    """
+    Cleans a description/about field in one call: drops source-site links and control
+    characters (one regex pass, only when a cheap gate finds something to drop), collapses
+    whitespace with str.split/join, then truncates. Equivalent to
+    `strip_source_site_urls(norm_space(text))` plus the control-char and length rules.
+    """
     if not text:
         return ""
-    cleaned = _SOURCE_SITE_URL_RE.sub("", text)
-    cleaned = _SOURCE_SITE_BARE_RE.sub("", cleaned)
-    return norm_space(cleaned)
+    drop_links = policy.strip_source_links and _SOURCE_SITE_HINT_RE.search(text) is not None
+    drop_controls = policy.strip_control_chars and _CONTROL_CHARS_RE.search(text) is not None
+    if drop_links or drop_controls:
+        text = _DROP_RE_BY_POLICY[(drop_links, drop_controls)].sub("", text)
+    # str.split() and re's \s agree on what whitespace is for str input.
+    text = " ".join(text.split())
+    if policy.max_chars is not None:
+        text = truncate_text(text, policy.max_chars, policy.ellipsis)
+    return text
+
+
+def strip_source_site_urls(text: str) -> str:
+    return sanitize_text(text, SOURCE_LINKS_POLICY)
 
 
 def ensure_category_ref(
@@ -521,6 +1012,8 @@ def build_imported_company(
     rubric_slugs_by_norm_name: dict[str, list[str]],
     used_rubric_slugs: set[str],
     rubric_ref_by_source_url: dict[str, dict[str, Any]],
+    description_policy: TextPolicy = DESCRIPTION_POLICY,
+    about_policy: TextPolicy = ABOUT_POLICY,
 ) -> tuple[dict[str, Any] | None, dict[str, Any]]:
     stats: dict[str, Any] = {}
     clean_name = norm_space(name)
@@ -534,6 +1027,9 @@ def build_imported_company(
 
     out_rubrics: list[dict[str, Any]] = []
     out_categories: dict[str, CategoryRef] = {}
+    # (rubric_name, rubric_url, slug, path) where path is "cache" | "name_match" | "new_slug".
+    rubric_mappings: list[tuple[str, str, str, str]] = []
+    stats["rubric_mappings"] = rubric_mappings
 
     for rubric_name, rubric_url in rubrics:
         cached = rubric_ref_by_source_url.get(rubric_url)
@@ -542,6 +1038,7 @@ def build_imported_company(
             if cat_slug:
                 out_categories[cat_slug] = ensure_category_ref(categories_by_slug, cat_slug)
             out_rubrics.append(cached)
+            rubric_mappings.append((rubric_name, rubric_url, cached["slug"], "cache"))
             continue
 
         rubric_name = norm_space(rubric_name) or "—"
@@ -575,6 +1072,7 @@ def build_imported_company(
             }
             out_rubrics.append(out_ref)
             rubric_ref_by_source_url[rubric_url] = out_ref
+            rubric_mappings.append((rubric_name, rubric_url, ref.slug, "name_match"))
             continue
 
         bi_cat, bi_rubric_segment = parse_source_site_rubric_url(rubric_url)
@@ -599,6 +1097,7 @@ def build_imported_company(
         }
         out_rubrics.append(out_ref)
         rubric_ref_by_source_url[rubric_url] = out_ref
+        rubric_mappings.append((rubric_name, rubric_url, slug, "new_slug"))
 
     if not out_rubrics:
         stats["skip_reason"] = "no_mapped_rubrics"
@@ -608,10 +1107,11 @@ def build_imported_company(
     emails = uniq_keep_order([normalize_email(e) for e in (emails or []) if normalize_email(e)])
     websites = clean_websites(websites or [])
 
-    description = strip_source_site_urls(norm_space(excerpt) or norm_space(about))
+    # Fall back to `about` when the excerpt is empty after sanitizing (e.g. only links/control chars).
+    description = sanitize_text(excerpt, description_policy) or sanitize_text(about, description_policy)
 
     city = extract_city(clean_address)
-    about_clean = strip_source_site_urls(norm_space(about))
+    about_clean = sanitize_text(about, about_policy)
 
     source_id = f"{IMPORTED_SOURCE_ID_PREFIX}{company_id}"
     obj: dict[str, Any] = {
@@ -643,6 +1143,898 @@ def build_imported_company(
     return obj, stats
 
 
+CATALOG_INDEX_VERSION = 1
+POSTINGS_SUFFIX = ".postings.bin"
+FACETS_SUFFIX = ".facets.json"
+
+
+def catalog_sidecar_path(jsonl_path: Path, suffix: str) -> Path:
+    # companies.jsonl -> companies.postings.bin / companies.facets.json
+    return jsonl_path.with_name(jsonl_path.stem + suffix)
+
+
+def encode_postings(ordinals: Iterable[int]) -> bytes:
+    """
+    Delta-encodes a strictly increasing list of company ordinals as LEB128 varints.
+    """
+    out = bytearray()
+    # Starting from -1 stores the first entry as ordinal + 1, so every delta is >= 1.
+    prev = -1
+    for ordinal in ordinals:
+        delta = ordinal - prev
+        if delta <= 0:
+            raise ValueError(f"postings must be strictly increasing: {prev} -> {ordinal}")
+        prev = ordinal
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> list[int]:
+    out: list[int] = []
+    prev = -1
+    delta = 0
+    shift = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        prev += delta
+        out.append(prev)
+        delta = 0
+        shift = 0
+    return out
+
+
+def build_catalog_index(companies: list[dict[str, Any]]) -> tuple[dict[str, dict[str, list[int]]], dict[str, Any]]:
+    """
+    Builds postings lists (company ordinals, i.e. JSONL line numbers) and facet counts
+    as src/lib/biznes/store.ts derives them at startup.
+
+    Postings groups: "category", "rubric", "region", plus per-region "category@<region>"
+    and "rubric@<region>". Ordinals follow the JSONL line order, which is the default
+    listing order on the site, so every postings list is already in default sort order.
+    A company is listed once per key even if it repeats a category/rubric.
+
+    Counts follow store.ts exactly rather than postings lengths: category/rubric counts
+    are incremented once per occurrence (a repeated ref counts twice), every line with a
+    `source_id` counts (duplicate ids included), while `companies_total` is the number of
+    distinct `source_id`s.
+    """
+    postings: dict[str, dict[str, list[int]]] = defaultdict(lambda: defaultdict(list))
+    categories: dict[str, dict[str, str]] = {}
+    rubrics: dict[str, dict[str, str]] = {}
+    counts: dict[str, Counter[str]] = defaultdict(Counter)
+    rubrics_by_category: dict[str, list[str]] = defaultdict(list)
+    listed_rubrics: set[tuple[str, str]] = set()
+    ids: list[str] = []
+
+    for ordinal, obj in enumerate(companies):
+        source_id = str(obj.get("source_id") or "").strip()
+        ids.append(source_id)
+        if not source_id:
+            continue
+
+        region_slug = normalize_region_slug(obj.get("city") or "", obj.get("region") or "", obj.get("address") or "")
+        if region_slug:
+            postings["region"][region_slug].append(ordinal)
+            counts["region"][region_slug] += 1
+
+        for c in obj.get("categories") or []:
+            slug = c.get("slug") or ""
+            if not slug:
+                continue
+            categories.setdefault(slug, {"slug": slug, "name": c.get("name") or slug, "url": c.get("url") or ""})
+            counts["category"][slug] += 1
+            if region_slug:
+                counts[f"category@{region_slug}"][slug] += 1
+            group = postings["category"][slug]
+            if group and group[-1] == ordinal:
+                continue
+            group.append(ordinal)
+            if region_slug:
+                postings[f"category@{region_slug}"][slug].append(ordinal)
+
+        for r in obj.get("rubrics") or []:
+            slug = r.get("slug") or ""
+            category_slug = r.get("category_slug") or ""
+            if not slug or not category_slug:
+                continue
+            counts["rubric"][slug] += 1
+            if region_slug:
+                counts[f"rubric@{region_slug}"][slug] += 1
+            # Like store.ts, a rubric is listed under every category it is referenced with.
+            if (category_slug, slug) not in listed_rubrics:
+                listed_rubrics.add((category_slug, slug))
+                rubrics_by_category[category_slug].append(slug)
+            rubrics.setdefault(
+                slug,
+                {
+                    "slug": slug,
+                    "name": r.get("name") or slug,
+                    "url": r.get("url") or "",
+                    "category_slug": category_slug,
+                    "category_name": r.get("category_name") or category_slug,
+                },
+            )
+            group = postings["rubric"][slug]
+            if group and group[-1] == ordinal:
+                continue
+            group.append(ordinal)
+            if region_slug:
+                postings[f"rubric@{region_slug}"][slug].append(ordinal)
+
+    for slugs in rubrics_by_category.values():
+        slugs.sort(key=lambda s: (ru_collation_key(rubrics[s]["name"]), s))
+
+    facets: dict[str, Any] = {
+        "version": CATALOG_INDEX_VERSION,
+        "companies_total": len({s for s in ids if s}),
+        "counts": {group: dict(sorted(by_key.items())) for group, by_key in sorted(counts.items())},
+        "categories": [categories[s] for s in sorted(categories, key=lambda s: (ru_collation_key(categories[s]["name"]), s))],
+        "rubrics": rubrics,
+        "rubrics_by_category": dict(sorted(rubrics_by_category.items())),
+        "ids": ids,
+    }
+    return postings, facets
+
+
+def write_catalog_jsonl(path: Path, companies: Iterable[dict[str, Any]]) -> list[int]:
+    """
+    Writes one JSON object per line and returns the byte offset of every line,
+    so readers can seek straight to a company by ordinal.
+    """
+    offsets: list[int] = []
+    pos = 0
+    with path.open("wb") as f:
+        for obj in companies:
+            line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+            offsets.append(pos)
+            f.write(line)
+            pos += len(line)
+    return offsets
+
+
+def write_catalog_index(jsonl_path: Path, companies: list[dict[str, Any]], line_offsets: list[int]) -> tuple[Path, Path]:
+    """
+    Writes `<stem>.postings.bin` (concatenated varint postings) and `<stem>.facets.json`
+    (facet counts, default sort order and [offset, nbytes] pointers into the postings file)
+    next to `jsonl_path`. Both are written via a `.tmp` file and `os.replace`.
+    """
+    postings, facets = build_catalog_index(companies)
+
+    postings_path = catalog_sidecar_path(jsonl_path, POSTINGS_SUFFIX)
+    facets_path = catalog_sidecar_path(jsonl_path, FACETS_SUFFIX)
+
+    pointers: dict[str, dict[str, list[int]]] = {}
+    tmp_postings = postings_path.with_suffix(postings_path.suffix + ".tmp")
+    with tmp_postings.open("wb") as f:
+        pos = 0
+        for group in sorted(postings):
+            pointers[group] = {}
+            for key in sorted(postings[group]):
+                blob = encode_postings(postings[group][key])
+                f.write(blob)
+                pointers[group][key] = [pos, len(blob)]
+                pos += len(blob)
+
+    facets["jsonl"] = jsonl_path.name
+    facets["postings"] = {"file": postings_path.name, "encoding": "delta-varint", "groups": pointers}
+    facets["line_offsets"] = line_offsets
+
+    tmp_facets = facets_path.with_suffix(facets_path.suffix + ".tmp")
+    with tmp_facets.open("w", encoding="utf-8") as f:
+        json.dump(facets, f, ensure_ascii=False, separators=(",", ":"))
+
+    os.replace(tmp_postings, postings_path)
+    os.replace(tmp_facets, facets_path)
+    return postings_path, facets_path
+
+
+GEO_SUFFIX = ".geo.json"
+GEO_CELL_DEG = 0.05  # ~5.5 km north-south, ~3.3 km east-west at Belarus latitudes
+EARTH_RADIUS_KM = 6371.0088
+
+
+def geo_cell(lat: float, lng: float, cell_deg: float = GEO_CELL_DEG) -> tuple[int, int]:
+    return (math.floor(lat / cell_deg), math.floor(lng / cell_deg))
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def build_geo_index(companies: list[dict[str, Any]], cell_deg: float = GEO_CELL_DEG) -> dict[str, Any]:
+    """
+    Uniform lat/lng grid over companies with coordinates. `points` holds
+    [ordinal, lat, lng] sorted by cell; `cells` maps "row:col" to a [start, end) slice of it.
+    """
+    by_cell: dict[tuple[int, int], list[list[Any]]] = defaultdict(list)
+    for ordinal, obj in enumerate(companies):
+        extra = obj.get("extra") if isinstance(obj.get("extra"), dict) else {}
+        lat, lng = extra.get("lat"), extra.get("lng")
+        if not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
+            continue
+        by_cell[geo_cell(lat, lng, cell_deg)].append([ordinal, lat, lng])
+
+    points: list[list[Any]] = []
+    cells: dict[str, list[int]] = {}
+    for cell in sorted(by_cell):
+        start = len(points)
+        points.extend(by_cell[cell])
+        cells[f"{cell[0]}:{cell[1]}"] = [start, len(points)]
+    return {"version": CATALOG_INDEX_VERSION, "cell_deg": cell_deg, "cells": cells, "points": points}
+
+
+def geo_radius_query(index: dict[str, Any], lat: float, lng: float, radius_km: float) -> list[tuple[int, float]]:
+    """
+    Returns (ordinal, distance_km) for points within `radius_km`, nearest first.
+    Only the grid cells overlapping the query's bounding box are visited.
+    """
+    cell_deg = float(index["cell_deg"])
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    dlng = dlat / max(0.01, math.cos(math.radians(lat)))
+    row_lo, col_lo = geo_cell(lat - dlat, lng - dlng, cell_deg)
+    row_hi, col_hi = geo_cell(lat + dlat, lng + dlng, cell_deg)
+
+    points = index["points"]
+    cells = index["cells"]
+    out: list[tuple[int, float]] = []
+    for row in range(row_lo, row_hi + 1):
+        for col in range(col_lo, col_hi + 1):
+            span = cells.get(f"{row}:{col}")
+            if not span:
+                continue
+            for ordinal, plat, plng in points[span[0] : span[1]]:
+                d = haversine_km(lat, lng, plat, plng)
+                if d <= radius_km:
+                    out.append((ordinal, d))
+    out.sort(key=lambda x: x[1])
+    return out
+
+
+def write_geo_index(jsonl_path: Path, companies: list[dict[str, Any]]) -> Path:
+    geo_path = catalog_sidecar_path(jsonl_path, GEO_SUFFIX)
+    tmp_path = geo_path.with_suffix(geo_path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(build_geo_index(companies), f, separators=(",", ":"))
+    os.replace(tmp_path, geo_path)
+    return geo_path
+
+
+@dataclass(frozen=True)
+class ImportDecision:
+    company_id: int
+    name: str
+    decision: str  # "imported" | "duplicate" | "skipped"
+    reason: str = ""
+    keys: DedupeKeys | None = None
+    company: dict[str, Any] | None = None
+    match_key: str = ""
+    match_source_id: str = ""
+    rubric_mappings: tuple[tuple[str, str, str, str], ...] = ()
+
+    @property
+    def source_id(self) -> str:
+        return f"{IMPORTED_SOURCE_ID_PREFIX}{self.company_id}"
+
+
+DECISION_LOG_SCHEMA = """
+CREATE TABLE run (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE decisions (
+    source_id TEXT PRIMARY KEY,
+    company_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    match_key TEXT NOT NULL,
+    match_source_id TEXT NOT NULL
+);
+CREATE INDEX decisions_by_decision ON decisions (decision, reason);
+CREATE INDEX decisions_by_match ON decisions (match_source_id);
+CREATE TABLE rubric_mappings (
+    source_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    rubric_name TEXT NOT NULL,
+    rubric_url TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (source_id, position)
+);
+CREATE INDEX rubric_mappings_by_slug ON rubric_mappings (slug);
+"""
+
+
+def write_decision_log(path: Path, decisions: list[ImportDecision], report: dict[str, Any]) -> None:
+    """
+    Writes one row per processed source company (decision, reason, matching dedupe key and
+    the source_id it collided with) plus how each of its rubrics was mapped, as an indexed
+    SQLite file. Compare two runs with --diff-decisions.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(DECISION_LOG_SCHEMA)
+        conn.executemany(
+            "INSERT INTO run (key, value) VALUES (?, ?)",
+            [("created_at", now_utc_compact()), ("report", json.dumps(report, ensure_ascii=False))],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (d.source_id, d.company_id, d.name, d.decision, d.reason, d.match_key, d.match_source_id)
+                for d in decisions
+            ),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO rubric_mappings VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (d.source_id, i, rubric_name, rubric_url, slug, mapping_path)
+                for d in decisions
+                for i, (rubric_name, rubric_url, slug, mapping_path) in enumerate(d.rubric_mappings)
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+def explain_decision(log_path: Path, source_id: str) -> None:
+    if not log_path.is_file():
+        raise FileNotFoundError(f"Decision log not found: {log_path}")
+    conn = sqlite3.connect(f"file:{log_path}?mode=ro", uri=True)
+    try:
+        row = conn.execute(
+            "SELECT company_id, name, decision, reason, match_key, match_source_id FROM decisions WHERE source_id = ?",
+            (source_id,),
+        ).fetchone()
+        if not row:
+            print(f"{source_id}: not in {log_path}")
+            return
+        company_id, name, decision, reason, match_key, match_source_id = row
+        print(f"{source_id} (id {company_id}) {name!r}: {decision}" + (f" ({reason})" if reason else ""))
+        if match_key:
+            print(f"  matched {reason} key {match_key!r} of {match_source_id or '(no source_id)'}")
+        for rubric_name, rubric_url, slug, mapping_path in conn.execute(
+            "SELECT rubric_name, rubric_url, slug, path FROM rubric_mappings WHERE source_id = ? ORDER BY position",
+            (source_id,),
+        ):
+            print(f"  rubric {rubric_name!r} -> {slug} [{mapping_path}] ({rubric_url})")
+    finally:
+        conn.close()
+
+
+def diff_decision_logs(old_path: Path, new_path: Path, *, limit: int = 20) -> dict[str, Any]:
+    """
+    Compares two decision logs without re-running the import: decision transitions per
+    source company and rubric slug changes. Prints examples and returns the summary.
+    """
+    for path in (old_path, new_path):
+        if not path.is_file():
+            raise FileNotFoundError(f"Decision log not found: {path}")
+    conn = sqlite3.connect(f"file:{new_path}?mode=ro", uri=True)
+    try:
+        conn.execute("ATTACH DATABASE ? AS old", (f"file:{old_path}?mode=ro",))
+
+        transitions: dict[str, int] = {}
+        for old_state, new_state, n in conn.execute(
+            """
+            SELECT
+                COALESCE(o.decision || CASE WHEN o.reason != '' THEN ':' || o.reason ELSE '' END, 'absent'),
+                COALESCE(n.decision || CASE WHEN n.reason != '' THEN ':' || n.reason ELSE '' END, 'absent'),
+                COUNT(*)
+            FROM (
+                SELECT source_id FROM main.decisions UNION SELECT source_id FROM old.decisions
+            ) AS ids
+            LEFT JOIN old.decisions AS o ON o.source_id = ids.source_id
+            LEFT JOIN main.decisions AS n ON n.source_id = ids.source_id
+            GROUP BY 1, 2
+            ORDER BY 3 DESC
+            """
+        ):
+            transitions[f"{old_state} -> {new_state}"] = n
+
+        changed_examples: list[tuple[str, str, str, str]] = conn.execute(
+            """
+            SELECT ids.source_id,
+                   COALESCE(o.decision || ':' || o.reason, 'absent'),
+                   COALESCE(n.decision || ':' || n.reason, 'absent'),
+                   COALESCE(n.match_source_id, '')
+            FROM (
+                SELECT source_id FROM main.decisions UNION SELECT source_id FROM old.decisions
+            ) AS ids
+            LEFT JOIN old.decisions AS o ON o.source_id = ids.source_id
+            LEFT JOIN main.decisions AS n ON n.source_id = ids.source_id
+            WHERE o.decision IS NOT n.decision OR o.reason IS NOT n.reason
+            ORDER BY ids.source_id
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+
+        rubric_changes: list[tuple[str, str, str, str]] = conn.execute(
+            """
+            SELECT n.source_id, n.rubric_name, o.slug, n.slug
+            FROM main.rubric_mappings AS n
+            JOIN old.rubric_mappings AS o ON o.source_id = n.source_id AND o.rubric_url = n.rubric_url
+            WHERE o.slug != n.slug
+            ORDER BY n.source_id, n.position
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+    changed = sum(n for k, n in transitions.items() if k.split(" -> ")[0] != k.split(" -> ")[1])
+    print(f"Decision changes: {changed}")
+    for key, n in transitions.items():
+        old_state, new_state = key.split(" -> ")
+        if old_state != new_state:
+            print(f"  {key}: {n}")
+    for source_id, old_state, new_state, match_source_id in changed_examples:
+        suffix = f" (matches {match_source_id})" if match_source_id else ""
+        print(f"  e.g. {source_id}: {old_state.rstrip(':')} -> {new_state.rstrip(':')}{suffix}")
+    print(f"Rubric slug changes: {len(rubric_changes)}")
+    for source_id, rubric_name, old_slug, new_slug in rubric_changes[:limit]:
+        print(f"  {source_id} {rubric_name!r}: {old_slug} -> {new_slug}")
+
+    summary = {
+        "old": str(old_path),
+        "new": str(new_path),
+        "decision_changes": changed,
+        "transitions": transitions,
+        "rubric_slug_changes": len(rubric_changes),
+    }
+    print("Diff:", json.dumps(summary, ensure_ascii=False))
+    return summary
+
+
+COLUMNAR_FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+_COLUMNAR_STRING_FIELDS = (
+    "source",
+    "source_id",
+    "source_url",
+    "name",
+    "unp",
+    "country",
+    "region",
+    "city",
+    "address",
+    "description",
+    "about",
+    "contact_person",
+    "logo_url",
+)
+
+
+def columnar_format_for(path: Path) -> str:
+    fmt = COLUMNAR_FORMATS.get(path.suffix.lower())
+    if not fmt:
+        raise ValueError(f"Unsupported columnar output {path.name!r}; use one of: {', '.join(sorted(COLUMNAR_FORMATS))}")
+    return fmt
+
+
+def columnar_schema() -> Any:
+    import pyarrow as pa
+
+    str_list = pa.list_(pa.string())
+    fields = [pa.field(name, pa.string()) for name in _COLUMNAR_STRING_FIELDS]
+    fields += [
+        pa.field("phones", str_list),
+        pa.field("phones_ext", pa.list_(pa.struct([("number", pa.string()), ("labels", str_list)]))),
+        pa.field("emails", str_list),
+        pa.field("websites", str_list),
+        pa.field("work_hours", pa.struct([("work_time", pa.string()), ("break_time", pa.string()), ("status", pa.string())])),
+        pa.field("categories", pa.list_(pa.struct([("slug", pa.string()), ("name", pa.string()), ("url", pa.string())]))),
+        pa.field(
+            "rubrics",
+            pa.list_(
+                pa.struct(
+                    [
+                        ("slug", pa.string()),
+                        ("name", pa.string()),
+                        ("url", pa.string()),
+                        ("category_slug", pa.string()),
+                        ("category_name", pa.string()),
+                    ]
+                )
+            ),
+        ),
+        pa.field("lat", pa.float64()),
+        pa.field("lng", pa.float64()),
+        # Import metadata (not part of the site JSONL).
+        pa.field("region_slug", pa.string()),
+        pa.field("import_status", pa.string()),  # kept | imported | duplicate | skipped
+        pa.field("import_reason", pa.string()),
+        pa.field("phone_keys", str_list),
+        pa.field("email_keys", str_list),
+        pa.field("domain_keys", str_list),
+        pa.field("name_address_key", pa.string()),
+    ]
+    return pa.schema(fields)
+
+
+def _columnar_row(obj: dict[str, Any], status: str, reason: str, keys: DedupeKeys | None) -> dict[str, Any]:
+    row: dict[str, Any] = {name: str(obj.get(name) or "") for name in _COLUMNAR_STRING_FIELDS}
+    row["phones"] = [str(v) for v in obj.get("phones") or []]
+    row["phones_ext"] = [
+        {"number": str(p.get("number") or ""), "labels": [str(v) for v in p.get("labels") or []]}
+        for p in obj.get("phones_ext") or []
+        if isinstance(p, dict)
+    ]
+    row["emails"] = [str(v) for v in obj.get("emails") or []]
+    row["websites"] = [str(v) for v in obj.get("websites") or []]
+    work_hours = obj.get("work_hours") if isinstance(obj.get("work_hours"), dict) else {}
+    row["work_hours"] = {
+        k: str(work_hours[k]) if work_hours.get(k) is not None else None for k in ("work_time", "break_time", "status")
+    }
+    row["categories"] = [
+        {k: str(c.get(k) or "") for k in ("slug", "name", "url")} for c in obj.get("categories") or []
+    ]
+    row["rubrics"] = [
+        {k: str(r.get(k) or "") for k in ("slug", "name", "url", "category_slug", "category_name")}
+        for r in obj.get("rubrics") or []
+    ]
+    extra = obj.get("extra") if isinstance(obj.get("extra"), dict) else {}
+    row["lat"] = extra.get("lat")
+    row["lng"] = extra.get("lng")
+    row["region_slug"] = normalize_region_slug(row["city"], row["region"], row["address"])
+    row["import_status"] = status
+    row["import_reason"] = reason
+    row["phone_keys"] = list(keys.phones) if keys else []
+    row["email_keys"] = list(keys.emails) if keys else []
+    row["domain_keys"] = list(keys.domains) if keys else []
+    row["name_address_key"] = keys.name_address if keys else ""
+    return row
+
+
+def write_columnar_catalog(path: Path, kept: list[dict[str, Any]], decisions: list[ImportDecision]) -> int:
+    """
+    Writes the merged catalog as Parquet or Arrow IPC (by file suffix) for analytics.
+    Rows are kept + imported companies, followed by duplicate/skipped source rows;
+    filter on `import_status` in ("kept", "imported") to get exactly the JSONL contents.
+    Requires pyarrow; the JSONL stays the source of truth for the site.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fmt = columnar_format_for(path)
+
+    rows: list[dict[str, Any]] = []
+    for obj, keys in zip(kept, company_dedupe_keys(kept)):
+        rows.append(_columnar_row(obj, "kept", "", keys))
+    for d in decisions:
+        if d.decision == "imported":
+            rows.append(_columnar_row(d.company or {}, d.decision, d.reason, d.keys))
+    for d in decisions:
+        if d.decision != "imported":
+            obj = d.company or {"source": "biznes", "source_id": d.source_id, "name": d.name}
+            rows.append(_columnar_row(obj, d.decision, d.reason, d.keys))
+
+    table = pa.Table.from_pylist(rows, schema=columnar_schema())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if fmt == "parquet":
+        pq.write_table(table, tmp_path, compression="zstd")
+    else:
+        with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return table.num_rows
+
+
+LOCK_SUFFIX = ".lock"
+GENERATIONS_DIR_SUFFIX = ".generations"
+CURRENT_LINK_SUFFIX = ".current"
+PARTIAL_GENERATION_SUFFIX = ".partial"
+
+
+def acquire_import_lock(dst: Path) -> IO[str]:
+    """
+    Takes an exclusive `fcntl` lock on `<dst>.lock`. Blocks while another import
+    publishing to the same destination is running.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = dst.with_name(dst.name + LOCK_SUFFIX)
+    f = lock_path.open("a", encoding="utf-8")
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print(f"Waiting for lock: {lock_path}")
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    return f
+
+
+def release_import_lock(f: IO[str]) -> None:
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    finally:
+        f.close()
+
+
+def fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def replace_symlink(link: Path, target: str) -> None:
+    """
+    Atomically points `link` at `target` (relative), replacing a file or symlink in place.
+    """
+    tmp = link.with_name(link.name + ".tmp-link")
+    if tmp.is_symlink() or tmp.exists():
+        tmp.unlink()
+    os.symlink(target, tmp)
+    os.replace(tmp, link)
+
+
+def generation_paths(dst: Path) -> tuple[Path, Path]:
+    # companies.jsonl -> companies.generations/ and companies.current
+    return (
+        dst.with_name(dst.stem + GENERATIONS_DIR_SUFFIX),
+        dst.with_name(dst.stem + CURRENT_LINK_SUFFIX),
+    )
+
+
+_GENERATION_NAME_RE = re.compile(r"^(\d{6,})-")
+
+
+def generation_seq(gen_dir: Path) -> int:
+    m = _GENERATION_NAME_RE.match(gen_dir.name)
+    return int(m.group(1)) if m else -1
+
+
+def list_generations(dst: Path) -> list[Path]:
+    """
+    Complete generations in publish order. Directory names start with a zero-padded
+    sequence number (`000003-<stamp>`); that number, not the timestamp, decides
+    which generation is older.
+    """
+    root, _ = generation_paths(dst)
+    if not root.is_dir():
+        return []
+    gens = [
+        p
+        for p in root.iterdir()
+        if p.is_dir() and not p.name.endswith(PARTIAL_GENERATION_SUFFIX) and generation_seq(p) >= 0
+    ]
+    return sorted(gens, key=lambda p: (generation_seq(p), p.name))
+
+
+def next_generation_dir(dst: Path, label: str) -> Path:
+    root, _ = generation_paths(dst)
+    seqs = [generation_seq(p) for p in root.iterdir()] if root.is_dir() else []
+    return root / f"{max(seqs, default=0) + 1:06d}-{label}"
+
+
+def catalog_bundle_names(dst: Path) -> list[str]:
+    return [
+        dst.name,
+        catalog_sidecar_path(dst, POSTINGS_SUFFIX).name,
+        catalog_sidecar_path(dst, FACETS_SUFFIX).name,
+        catalog_sidecar_path(dst, GEO_SUFFIX).name,
+    ]
+
+
+def read_catalog_lines(path: Path) -> tuple[list[dict[str, Any]], list[int]]:
+    """
+    Reads a catalog JSONL as-is: one dict per line (`{}` for blank/invalid lines, so
+    ordinals stay equal to line numbers) plus the byte offset of every line.
+    """
+    companies: list[dict[str, Any]] = []
+    offsets: list[int] = []
+    pos = 0
+    with path.open("rb") as f:
+        for raw in f:
+            offsets.append(pos)
+            pos += len(raw)
+            try:
+                obj = json.loads(raw)
+            except Exception:
+                obj = {}
+            companies.append(obj if isinstance(obj, dict) else {})
+    return companies, offsets
+
+
+def adopt_legacy_catalog(dst: Path) -> None:
+    """
+    First publish into a directory that still holds plain files: move them into a
+    generation so the pre-generation catalog stays available for rollback. Sidecars
+    the legacy catalog lacks are built from its JSONL, so the generation is complete.
+    """
+    if dst.is_symlink() or not dst.exists():
+        return
+    stamp = datetime.fromtimestamp(dst.stat().st_mtime, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    gen_dir = next_generation_dir(dst, f"{stamp}-legacy")
+    gen_dir.mkdir(parents=True)
+    for name in catalog_bundle_names(dst):
+        src = dst.with_name(name)
+        if src.exists() and not src.is_symlink():
+            shutil.copy2(src, gen_dir / name)
+
+    jsonl_path = gen_dir / dst.name
+    bundle = [gen_dir / name for name in catalog_bundle_names(dst)]
+    if not all(p.exists() for p in bundle):
+        companies, line_offsets = read_catalog_lines(jsonl_path)
+        write_catalog_index(jsonl_path, companies, line_offsets)
+        write_geo_index(jsonl_path, companies)
+    for p in bundle:
+        fsync_path(p)
+    fsync_path(gen_dir)
+    activate_generation(dst, gen_dir)
+
+
+def activate_generation(dst: Path, gen_dir: Path) -> None:
+    """
+    Flips `<stem>.current` to `gen_dir` with a single rename, then makes sure every
+    public file name (`companies.jsonl` and its sidecars) present in `gen_dir` is a
+    symlink through it; links for names the generation lacks are removed.
+    """
+    root, current = generation_paths(dst)
+    replace_symlink(current, f"{root.name}/{gen_dir.name}")
+    for name in catalog_bundle_names(dst):
+        link = dst.with_name(name)
+        target = f"{current.name}/{name}"
+        if not (gen_dir / name).exists():
+            if link.is_symlink():
+                link.unlink()
+            continue
+        if link.is_symlink() and os.readlink(link) == target:
+            continue
+        replace_symlink(link, target)
+    fsync_path(dst.parent)
+
+
+def prune_generations(dst: Path, keep: int) -> None:
+    root, current = generation_paths(dst)
+    live = current.resolve() if current.is_symlink() else None
+    gens = list_generations(dst)
+    for gen_dir in gens[: max(0, len(gens) - keep)]:
+        if live is not None and gen_dir.resolve() == live:
+            continue
+        shutil.rmtree(gen_dir, ignore_errors=True)
+    if root.is_dir():
+        for p in root.iterdir():
+            if p.name.endswith(PARTIAL_GENERATION_SUFFIX):
+                shutil.rmtree(p, ignore_errors=True)
+
+
+def publish_generation(dst: Path, companies: list[dict[str, Any]], *, keep_generations: int) -> Path:
+    """
+    Writes the catalog and its sidecars into a fresh generation directory, fsyncs it and
+    flips `<stem>.current` to it. Readers opening `companies.jsonl` always see one complete
+    generation. Keeps the newest `keep_generations` generations for rollback.
+    Must be called with the import lock held.
+    """
+    adopt_legacy_catalog(dst)
+
+    root, _ = generation_paths(dst)
+    root.mkdir(parents=True, exist_ok=True)
+    gen_dir = next_generation_dir(dst, now_utc_compact())
+
+    partial = gen_dir.with_name(gen_dir.name + PARTIAL_GENERATION_SUFFIX)
+    partial.mkdir()
+    jsonl_path = partial / dst.name
+    line_offsets = write_catalog_jsonl(jsonl_path, companies)
+    write_catalog_index(jsonl_path, companies, line_offsets)
+    write_geo_index(jsonl_path, companies)
+    for name in catalog_bundle_names(dst):
+        fsync_path(partial / name)
+    fsync_path(partial)
+
+    os.rename(partial, gen_dir)
+    fsync_path(root)
+
+    activate_generation(dst, gen_dir)
+    prune_generations(dst, keep_generations)
+    return gen_dir
+
+
+def rollback_generation(dst: Path) -> Path:
+    """
+    Points `<stem>.current` at the generation published before the live one.
+    """
+    _, current = generation_paths(dst)
+    if not current.is_symlink():
+        raise FileNotFoundError(f"No published generations for: {dst}")
+    live = current.resolve()
+    live_seq = generation_seq(live)
+    older = [g for g in list_generations(dst) if g.resolve() != live and generation_seq(g) < live_seq]
+    if not older:
+        raise FileNotFoundError(f"No generation older than {live.name} to roll back to")
+    activate_generation(dst, older[-1])
+    return older[-1]
+
+
+_U64 = (1 << 64) - 1
+
+
+def _splitmix64(x: int) -> int:
+    z = (x + 0x9E3779B97F4A7C15) & _U64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _U64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _U64
+    return z ^ (z >> 31)
+
+
+@dataclass(frozen=True)
+class SourceFilter:
+    """
+    Restricts which source rows are imported. The id range is pushed down into SQL;
+    `sample_rate` keeps a deterministic fraction of ids (splitmix64 hash), so repeated
+    preview runs see the same sample without periodic patterns in ids biasing it.
+    """
+
+    id_from: int | None = None
+    id_to: int | None = None
+    sample_rate: float | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.id_from is not None or self.id_to is not None or self.sample_rate is not None
+
+    def sql(self, id_column: str) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if self.id_from is not None:
+            clauses.append(f"{id_column} >= ?")
+            params.append(self.id_from)
+        if self.id_to is not None:
+            clauses.append(f"{id_column} <= ?")
+            params.append(self.id_to)
+        return "".join(f" AND {c}" for c in clauses), params
+
+    def sampled(self, company_id: int) -> bool:
+        if self.sample_rate is None:
+            return True
+        return _splitmix64(company_id) < self.sample_rate * 2**64
+
+    def describe(self) -> dict[str, Any]:
+        return {k: v for k, v in (("id_from", self.id_from), ("id_to", self.id_to), ("sample_rate", self.sample_rate)) if v is not None}
+
+
+_SOURCE_COMPANY_COLUMNS = "id, name, excerpt, about, address, phones_json, emails_json, websites_json"
+
+
+def iter_source_company_rows(conn: sqlite3.Connection, source_filter: SourceFilter) -> Iterable[tuple[Any, ...]]:
+    """
+    Yields `done` source companies in id order. With a sample rate, only ids are read
+    for the range, hashed in Python, and the chosen rows are fetched in `IN (...)` chunks.
+    """
+    filter_sql, filter_params = source_filter.sql("id")
+    base = f"SELECT {_SOURCE_COMPANY_COLUMNS} FROM companies WHERE status='done'"
+    if source_filter.sample_rate is None:
+        # Plain loops (not `yield from`): closing the generator must not close a cursor
+        # after the connection is gone.
+        for row in conn.execute(base + filter_sql + " ORDER BY id", filter_params):
+            yield row
+        return
+    ids = [
+        int(row[0])
+        for row in conn.execute("SELECT id FROM companies WHERE status='done'" + filter_sql + " ORDER BY id", filter_params)
+        if source_filter.sampled(int(row[0]))
+    ]
+    for start in range(0, len(ids), _SQL_IN_CHUNK):
+        chunk = ids[start : start + _SQL_IN_CHUNK]
+        for row in conn.execute(base + f" AND id IN ({','.join('?' * len(chunk))}) ORDER BY id", chunk):
+            yield row
+
+
 def import_info_db(
     *,
     info_db: Path,
@@ -652,136 +2044,177 @@ def import_info_db(
     in_place: bool,
     backup: bool,
     dry_run: bool,
+    keep_generations: int = 0,
+    columnar_out: Path | None = None,
+    decision_log: Path | None = None,
+    source_filter: SourceFilter = SourceFilter(),
+    description_policy: TextPolicy = DESCRIPTION_POLICY,
+    about_policy: TextPolicy = ABOUT_POLICY,
+    geocoder: Geocoder | None = None,
 ) -> None:
     if not existing_jsonl.exists():
         raise FileNotFoundError(f"Existing catalog JSONL not found: {existing_jsonl}")
     if not info_db.exists():
         raise FileNotFoundError(f"Source DB not found: {info_db}")
 
-    kept, categories_by_slug, rubrics_by_slug, rubric_slugs_by_norm_name = load_existing_catalog(existing_jsonl)
-
-    existing_phones, existing_emails, existing_domains, existing_name_addr = build_dedupe_sets(kept)
+    dst = existing_jsonl if in_place else output_jsonl
+    # Held from reading the existing catalog until publish, so overlapping runs serialize.
+    lock = None if dry_run else acquire_import_lock(dst)
 
     conn = sqlite3.connect(f"file:{info_db}?mode=ro", uri=True)
     conn.execute("PRAGMA busy_timeout=5000")
     try:
-        rubrics_by_company = load_source_site_rubrics(conn)
-
-        cur = conn.execute(
-            "SELECT id, name, excerpt, about, address, phones_json, emails_json, websites_json FROM companies WHERE status='done' ORDER BY id"
+        kept, categories_by_slug, rubrics_by_slug, rubric_slugs_by_norm_name = load_existing_catalog(
+            existing_jsonl, sanitize=not dry_run
         )
 
+        existing_phones, existing_emails, existing_domains, existing_name_addr = build_dedupe_sets(kept)
+
+        # Preview runs (limit/range/sample) load rubrics per fetched chunk instead of the whole table.
+        preview = source_filter.active or max_companies is not None
+        rubrics_by_company = {} if preview else load_source_site_rubrics(conn)
+
+        source_rows = iter(iter_source_company_rows(conn, source_filter))
+
         imported: list[dict[str, Any]] = []
+        decisions: list[ImportDecision] = []
+        # Per-row decisions are only kept for the outputs that need them; company dicts
+        # (up to ~20k chars of text each) only for the columnar export.
+        keep_company = columnar_out is not None and not dry_run
+        record_decisions = decision_log is not None or keep_company
         duplicates = Counter()
         skipped = Counter()
 
         # Track dedupe keys across newly imported rows too.
-        new_phones: set[str] = set()
-        new_emails: set[str] = set()
-        new_domains: set[str] = set()
-        new_name_addr: set[str] = set()
+        new_index: tuple[DedupeIndex, DedupeIndex, DedupeIndex, DedupeIndex] = ({}, {}, {}, {})
+        new_phones, new_emails, new_domains, new_name_addr = new_index
 
         used_rubric_slugs: set[str] = set(rubrics_by_slug.keys())
         rubric_ref_by_source_url: dict[str, dict[str, Any]] = {}
 
         processed = 0
-        for row in cur:
-            company_id = int(row[0])
-            processed += 1
-            if max_companies is not None and len(imported) >= max_companies:
+        stop = False
+        while not stop:
+            batch_size = DEDUPE_BATCH_SIZE
+            if max_companies is not None:
+                if len(imported) >= max_companies:
+                    break
+                # Fetch only what the limit still needs; rows lost to dedupe/skips are refetched.
+                batch_size = min(batch_size, max_companies - len(imported))
+            rows = list(itertools.islice(source_rows, batch_size))
+            if not rows:
                 break
+            if preview:
+                rubrics_by_company = load_source_site_rubrics(conn, [int(row[0]) for row in rows])
+
+            built: list[tuple[int, str, dict[str, Any] | None, dict[str, Any]]] = []
+            for row in rows:
+                company_id = int(row[0])
+                name = row[1] or ""
+                excerpt = row[2] or ""
+                about = row[3] or ""
+                address = row[4] or ""
+                try:
+                    phones = json.loads(row[5] or "[]")
+                except Exception:
+                    phones = []
+                try:
+                    emails = json.loads(row[6] or "[]")
+                except Exception:
+                    emails = []
+                try:
+                    websites = json.loads(row[7] or "[]")
+                except Exception:
+                    websites = []
+
+                rubrics = rubrics_by_company.get(company_id, [])
+
+                built.append(
+                    (company_id, name)
+                    + build_imported_company(
+                        company_id=company_id,
+                        name=name,
+                        excerpt=excerpt,
+                        about=about,
+                        address=address,
+                        phones=phones,
+                        emails=emails,
+                        websites=websites,
+                        rubrics=rubrics,
+                        categories_by_slug=categories_by_slug,
+                        rubrics_by_slug=rubrics_by_slug,
+                        rubric_slugs_by_norm_name=rubric_slugs_by_norm_name,
+                        used_rubric_slugs=used_rubric_slugs,
+                        rubric_ref_by_source_url=rubric_ref_by_source_url,
+                        description_policy=description_policy,
+                        about_policy=about_policy,
+                    )
+                )
 
-            name = row[1] or ""
-            excerpt = row[2] or ""
-            about = row[3] or ""
-            address = row[4] or ""
-            try:
-                phones = json.loads(row[5] or "[]")
-            except Exception:
-                phones = []
-            try:
-                emails = json.loads(row[6] or "[]")
-            except Exception:
-                emails = []
-            try:
-                websites = json.loads(row[7] or "[]")
-            except Exception:
-                websites = []
-
-            rubrics = rubrics_by_company.get(company_id, [])
-
-            obj, _stats = build_imported_company(
-                company_id=company_id,
-                name=name,
-                excerpt=excerpt,
-                about=about,
-                address=address,
-                phones=phones,
-                emails=emails,
-                websites=websites,
-                rubrics=rubrics,
-                categories_by_slug=categories_by_slug,
-                rubrics_by_slug=rubrics_by_slug,
-                rubric_slugs_by_norm_name=rubric_slugs_by_norm_name,
-                used_rubric_slugs=used_rubric_slugs,
-                rubric_ref_by_source_url=rubric_ref_by_source_url,
-            )
-
-            if not obj:
-                skipped[_stats.get("skip_reason", "unknown")] += 1
-                continue
-
-            # Dedupe: skip only on strong signals.
-            key_name = norm_text(obj.get("name") or "")
-            key_addr = norm_text(obj.get("address") or "")
-            key_name_addr = f"{key_name}||{key_addr}" if key_name and key_addr else ""
+            keys_by_obj = iter(company_dedupe_keys([obj for _, _, obj, _ in built if obj]))
 
-            matched_reason = ""
-            for p in obj.get("phones") or []:
-                np = normalize_phone(p)
-                if len(np) >= 9 and (np in existing_phones or np in new_phones):
-                    matched_reason = "phone"
+            # Dedupe is sequential: each accepted row adds its keys before the next row is checked.
+            for company_id, name, obj, _stats in built:
+                if max_companies is not None and len(imported) >= max_companies:
+                    stop = True
                     break
-            if not matched_reason:
-                for e in obj.get("emails") or []:
-                    ne = normalize_email(e)
-                    if ne and (ne in existing_emails or ne in new_emails):
-                        matched_reason = "email"
-                        break
-            if not matched_reason:
-                for w in obj.get("websites") or []:
-                    host = normalize_domain(w)
-                    if not host or is_ignored_domain(host):
-                        continue
-                    if host in existing_domains or host in new_domains:
-                        matched_reason = "domain"
+                processed += 1
+
+                if not obj:
+                    reason = _stats.get("skip_reason", "unknown")
+                    skipped[reason] += 1
+                    if record_decisions:
+                        decisions.append(
+                            ImportDecision(
+                                company_id,
+                                norm_space(name),
+                                "skipped",
+                                reason,
+                                rubric_mappings=tuple(_stats.get("rubric_mappings") or ()),
+                            )
+                        )
+                    continue
+
+                # Dedupe: skip only on strong signals.
+                keys = next(keys_by_obj)
+                matched_reason = ""
+                match_key, match_source_id = "", ""
+                for reason, candidates, existing_index, new_keys in (
+                    ("phone", keys.phones, existing_phones, new_phones),
+                    ("email", keys.emails, existing_emails, new_emails),
+                    ("domain", keys.domains, existing_domains, new_domains),
+                    ("name_address", (keys.name_address,) if keys.name_address else (), existing_name_addr, new_name_addr),
+                ):
+                    match_key, match_source_id = find_dedupe_match(candidates, existing_index, new_keys)
+                    if match_key:
+                        matched_reason = reason
                         break
-            if not matched_reason and key_name_addr:
-                if key_name_addr in existing_name_addr or key_name_addr in new_name_addr:
-                    matched_reason = "name_address"
 
-            if matched_reason:
-                duplicates[matched_reason] += 1
-                continue
+                if record_decisions:
+                    decisions.append(
+                        ImportDecision(
+                            company_id,
+                            obj["name"],
+                            "duplicate" if matched_reason else "imported",
+                            matched_reason,
+                            keys,
+                            obj if keep_company else None,
+                            match_key=match_key,
+                            match_source_id=match_source_id,
+                            rubric_mappings=tuple(_stats.get("rubric_mappings") or ()),
+                        )
+                    )
 
-            # Update new dedupe sets.
-            for p in obj.get("phones") or []:
-                np = normalize_phone(p)
-                if len(np) >= 9:
-                    new_phones.add(np)
-            for e in obj.get("emails") or []:
-                ne = normalize_email(e)
-                if ne:
-                    new_emails.add(ne)
-            for w in obj.get("websites") or []:
-                host = normalize_domain(w)
-                if not host or is_ignored_domain(host):
+                if matched_reason:
+                    duplicates[matched_reason] += 1
                     continue
-                new_domains.add(host)
-            if key_name_addr:
-                new_name_addr.add(key_name_addr)
 
-            imported.append(obj)
+                # Update new dedupe sets.
+                add_dedupe_keys(new_index, keys, obj["source_id"])
+
+                if geocoder is not None:
+                    geocoder.apply(obj)
+                imported.append(obj)
 
         combined_count = len(kept) + len(imported)
         print(f"Existing kept (non-imported): {len(kept)}")
@@ -800,12 +2233,20 @@ def import_info_db(
             "skipped": dict(skipped),
             "output_jsonl": str(output_jsonl),
         }
+        if geocoder is not None:
+            report["geocoded"] = dict(geocoder.stats)
+        if source_filter.active:
+            report["source_filter"] = source_filter.describe()
         print("Report:", json.dumps(report, ensure_ascii=False))
 
+        # Written on --dry-run too: explaining a run is its main use.
+        if decision_log is not None:
+            write_decision_log(decision_log, decisions, report)
+            print(f"Wrote: {decision_log}")
+
         if dry_run:
             return
 
-        dst = existing_jsonl if in_place else output_jsonl
         dst.parent.mkdir(parents=True, exist_ok=True)
 
         if backup and in_place and existing_jsonl.exists():
@@ -813,17 +2254,38 @@ def import_info_db(
             print(f"Backup: {existing_jsonl} -> {backup_path}")
             backup_path.write_bytes(existing_jsonl.read_bytes())
 
-        tmp_path = dst.with_suffix(dst.suffix + ".tmp")
-        with tmp_path.open("w", encoding="utf-8") as f:
-            for obj in kept:
-                f.write(json.dumps(obj, ensure_ascii=False) + "\n")
-            for obj in imported:
-                f.write(json.dumps(obj, ensure_ascii=False) + "\n")
-
-        os.replace(tmp_path, dst)
-        print(f"Wrote: {dst}")
+        combined = kept + imported
+        if keep_generations > 0:
+            gen_dir = publish_generation(dst, combined, keep_generations=keep_generations)
+            print(f"Published generation: {gen_dir}")
+            print(f"Wrote: {dst} -> {os.readlink(dst)}")
+        else:
+            tmp_path = dst.with_suffix(dst.suffix + ".tmp")
+            line_offsets = write_catalog_jsonl(tmp_path, combined)
+            fsync_path(tmp_path)
+
+            # Sidecars go first: the site reloads on JSONL mtime change and should find a matching index.
+            postings_path, facets_path = write_catalog_index(dst, combined, line_offsets)
+            print(f"Wrote: {postings_path}")
+            print(f"Wrote: {facets_path}")
+            print(f"Wrote: {write_geo_index(dst, combined)}")
+
+            os.replace(tmp_path, dst)
+            fsync_path(dst.parent)
+            print(f"Wrote: {dst}")
+
+        # Analytics export runs after the catalog is published; its failure must not block the site update.
+        if columnar_out is not None:
+            try:
+                rows_written = write_columnar_catalog(columnar_out, kept, decisions)
+            except Exception as e:
+                print(f"WARNING: columnar export to {columnar_out} failed: {type(e).__name__}: {e}")
+            else:
+                print(f"Wrote: {columnar_out} ({rows_written} rows)")
     finally:
         conn.close()
+        if lock is not None:
+            release_import_lock(lock)
 
 
 def main() -> int:
@@ -839,11 +2301,109 @@ def main() -> int:
     p.add_argument("--existing-jsonl", default=str(default_existing), help="Existing catalog companies.jsonl path")
     p.add_argument("--output-jsonl", default=str(default_output), help="Output JSONL path (if not --in-place)")
     p.add_argument("--max-companies", type=int, default=0, help="Limit imported companies (0 = no limit)")
+    p.add_argument("--id-from", type=int, default=None, help="Only import source companies with id >= this")
+    p.add_argument("--id-to", type=int, default=None, help="Only import source companies with id <= this")
+    p.add_argument(
+        "--sample-rate",
+        type=float,
+        default=None,
+        help="Only import a deterministic sample of source companies (0 < rate <= 1), e.g. 0.01 for a quick preview",
+    )
     p.add_argument("--in-place", action="store_true", help="Overwrite --existing-jsonl (recommended with --backup)")
     p.add_argument("--backup", action="store_true", help="Create a timestamped backup before overwriting")
     p.add_argument("--dry-run", action="store_true", help="Do not write files, only print summary")
+    p.add_argument(
+        "--keep-generations",
+        type=int,
+        default=0,
+        help="Publish into generation dirs behind a `current` symlink, keeping this many (0 = plain file replace)",
+    )
+    p.add_argument("--rollback", action="store_true", help="Point the catalog back at the previous generation and exit")
+    p.add_argument(
+        "--columnar-out",
+        default="",
+        help="Also write the merged catalog with import metadata as .parquet or .arrow (requires pyarrow)",
+    )
+    p.add_argument(
+        "--decision-log",
+        default="",
+        help="Write a per-company decision log (SQLite) to this path; also written with --dry-run",
+    )
+    p.add_argument("--explain", default="", metavar="SOURCE_ID", help="Print the logged decision for one company from --decision-log and exit")
+    p.add_argument(
+        "--diff-decisions",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Compare two decision logs and exit (no import is run)",
+    )
+    p.add_argument(
+        "--description-max-chars",
+        type=int,
+        default=DESCRIPTION_POLICY.max_chars,
+        help="Truncate imported descriptions to this many characters (0 = no limit)",
+    )
+    p.add_argument(
+        "--about-max-chars",
+        type=int,
+        default=ABOUT_POLICY.max_chars,
+        help="Truncate imported 'about' texts to this many characters (0 = no limit)",
+    )
+    p.add_argument(
+        "--gazetteer",
+        default="",
+        help="Offline Belarus gazetteer TSV (city, street, lat, lng) used to fill extra.lat/lng of imported companies",
+    )
+    p.add_argument(
+        "--geocode-city-fallback",
+        action="store_true",
+        help="Use the settlement centroid when the street is not in the gazetteer",
+    )
     args = p.parse_args()
 
+    if args.diff_decisions:
+        try:
+            diff_decision_logs(Path(args.diff_decisions[0]), Path(args.diff_decisions[1]))
+        except FileNotFoundError as e:
+            p.error(f"--diff-decisions: {e}")
+        return 0
+    if args.explain:
+        if not args.decision_log:
+            p.error("--explain requires --decision-log")
+        try:
+            explain_decision(Path(args.decision_log), args.explain.strip())
+        except FileNotFoundError as e:
+            p.error(f"--explain: {e}")
+        return 0
+
+    if args.sample_rate is not None and not (0 < args.sample_rate <= 1):
+        p.error("--sample-rate must be in (0, 1]")
+    for flag, value, policy in (
+        ("--description-max-chars", args.description_max_chars, DESCRIPTION_POLICY),
+        ("--about-max-chars", args.about_max_chars, ABOUT_POLICY),
+    ):
+        if value < 0 or 0 < value <= len(policy.ellipsis):
+            p.error(f"{flag} must be 0 (no limit) or greater than {len(policy.ellipsis)}")
+
+    columnar_out = Path(args.columnar_out) if args.columnar_out else None
+    if columnar_out is not None:
+        try:
+            columnar_format_for(columnar_out)
+            import pyarrow  # noqa: F401
+        except (ValueError, ImportError) as e:
+            p.error(f"--columnar-out: {e}")
+
+    if args.rollback:
+        dst = Path(args.existing_jsonl) if args.in_place else Path(args.output_jsonl)
+        lock = acquire_import_lock(dst)
+        try:
+            gen_dir = rollback_generation(dst)
+        except FileNotFoundError as e:
+            p.error(f"--rollback: {e}")
+        finally:
+            release_import_lock(lock)
+        print(f"Rolled back: {dst} -> {gen_dir}")
+        return 0
+
     import_info_db(
         info_db=Path(args.info_db),
         existing_jsonl=Path(args.existing_jsonl),
@@ -852,6 +2412,21 @@ def main() -> int:
         in_place=bool(args.in_place),
         backup=bool(args.backup),
         dry_run=bool(args.dry_run),
+        keep_generations=max(0, args.keep_generations),
+        columnar_out=columnar_out,
+        decision_log=Path(args.decision_log) if args.decision_log else None,
+        source_filter=SourceFilter(
+            id_from=args.id_from,
+            id_to=args.id_to,
+            sample_rate=args.sample_rate if args.sample_rate is not None and args.sample_rate < 1 else None,
+        ),
+        description_policy=replace(DESCRIPTION_POLICY, max_chars=args.description_max_chars or None),
+        about_policy=replace(ABOUT_POLICY, max_chars=args.about_max_chars or None),
+        geocoder=(
+            Geocoder(Gazetteer.load(Path(args.gazetteer)), city_fallback=bool(args.geocode_city_fallback))
+            if args.gazetteer
+            else None
+        ),
     )
     return 0
 
@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Load-test the Biznes API against a local stack to see how a catalog build affects latency.
+
+Key behavior:
+- Replays a recorded query log (nginx access log or one request path per line), or builds a
+  synthetic Zipfian mix of search / suggest / rubric / company / catalog requests from a catalog JSONL.
+- Runs the same request plan against one or more base URLs with a fixed concurrency and reports
+  p50/p95/p99 latency, error counts and throughput per endpoint (first request = cold/startup cost).
+- Saves results as JSON and compares two saved runs (e.g. two catalog builds) side by side.
+- Optionally serves a stub Meilisearch (`down`: app falls back to the in-memory store; `empty`:
+  healthy, no hits) and times an indexing command.
+
+Typical usage (from repo root):
+  python3 biznes.lucheestiy.com/app/scripts/loadtest_biznes.py --catalog biznes.lucheestiy.com/app/public/data/biznes/companies.jsonl \\
+      --base-url http://localhost:8102 --concurrency 16 --requests 5000 --save /tmp/biznes-load-new.json
+  python3 biznes.lucheestiy.com/app/scripts/loadtest_biznes.py --compare /tmp/biznes-load-old.json /tmp/biznes-load-new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import re
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterable
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote, urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+
+REGIONS = ["minsk", "minsk-region", "brest", "vitebsk", "gomel", "grodno", "mogilev"]
+
+# Endpoint name -> path prefix; order matters (first match wins).
+ENDPOINTS: list[tuple[str, str]] = [
+    ("search", "/api/biznes/search"),
+    ("suggest", "/api/biznes/suggest"),
+    ("rubric", "/api/biznes/rubric"),
+    ("company", "/api/biznes/company/"),
+    ("catalog", "/api/biznes/catalog"),
+]
+
+DEFAULT_MIX = "search=35,suggest=30,rubric=20,company=10,catalog=5"
+
+_ACCESS_LOG_REQUEST_RE = re.compile(r'"(?:GET|HEAD) (\S+) HTTP/[\d.]+"')
+_WORD_RE = re.compile(r"[0-9a-zа-яё]{3,}", flags=re.IGNORECASE)
+
+
+def now_utc_compact() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def endpoint_for_path(path: str) -> str:
+    for name, prefix in ENDPOINTS:
+        if path.startswith(prefix):
+            return name
+    return ""
+
+
+def parse_mix(raw: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in (raw or "").split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in dict(ENDPOINTS):
+            raise ValueError(f"Unknown endpoint in mix: {name!r}")
+        mix[name] = float(weight or 0)
+    if not any(w > 0 for w in mix.values()):
+        raise ValueError("Mix has no positive weights")
+    return mix
+
+
+# ---------------------------------------------------------------------------
+# Request plans
+# ---------------------------------------------------------------------------
+
+
+def load_query_log(path: Path) -> list[tuple[str, str]]:
+    """
+    Reads request paths from an nginx access log (`"GET /api/... HTTP/1.1"`) or a plain file
+    with one path or URL per line. Only known API endpoints are kept, in log order.
+    """
+    plan: list[tuple[str, str]] = []
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            raw = line.strip()
+            if not raw or raw.startswith("#"):
+                continue
+            m = _ACCESS_LOG_REQUEST_RE.search(raw)
+            target = m.group(1) if m else raw.split()[0]
+            if "://" in target:
+                parts = urlsplit(target)
+                target = parts.path + (f"?{parts.query}" if parts.query else "")
+            endpoint = endpoint_for_path(target)
+            if endpoint:
+                plan.append((endpoint, target))
+    return plan
+
+
+class ZipfSampler:
+    """
+    Samples items by popularity rank with P(rank) ~ 1 / rank**s.
+    """
+
+    def __init__(self, items: list[Any], s: float) -> None:
+        if not items:
+            raise ValueError("ZipfSampler needs at least one item")
+        self.items = items
+        self.cum_weights = list(itertools.accumulate(1.0 / (rank**s) for rank in range(1, len(items) + 1)))
+
+    def sample(self, rnd: random.Random) -> Any:
+        return rnd.choices(self.items, cum_weights=self.cum_weights, k=1)[0]
+
+
+@dataclass
+class CatalogVocabulary:
+    company_ids: list[str]
+    rubric_slugs: list[str]  # most popular first
+    terms: list[str]  # most frequent first
+
+
+def load_catalog_vocabulary(path: Path, max_terms: int = 5000) -> CatalogVocabulary:
+    company_ids: list[str] = []
+    rubric_counts: Counter[str] = Counter()
+    term_counts: Counter[str] = Counter()
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            source_id = str(obj.get("source_id") or "").strip()
+            if not source_id:
+                continue
+            company_ids.append(source_id)
+            for r in obj.get("rubrics") or []:
+                if r.get("slug"):
+                    rubric_counts[r["slug"]] += 1
+                    term_counts.update(w.casefold() for w in _WORD_RE.findall(r.get("name") or ""))
+            term_counts.update(w.casefold() for w in _WORD_RE.findall(obj.get("name") or ""))
+    return CatalogVocabulary(
+        company_ids=company_ids,
+        rubric_slugs=[slug for slug, _ in rubric_counts.most_common()],
+        terms=[term for term, _ in term_counts.most_common(max_terms)],
+    )
+
+
+def synthetic_plan(
+    vocab: CatalogVocabulary, *, n: int, mix: dict[str, float], zipf_s: float, region_rate: float, seed: int
+) -> list[tuple[str, str]]:
+    """
+    Builds `n` requests: endpoints drawn by `mix`, search terms / rubrics / companies drawn
+    by Zipf over popularity (companies over a seeded shuffle), optional region filter.
+    """
+    rnd = random.Random(seed)
+    terms = ZipfSampler(vocab.terms or ["компания"], zipf_s)
+    rubrics = ZipfSampler(vocab.rubric_slugs, zipf_s) if vocab.rubric_slugs else None
+    shuffled_ids = list(vocab.company_ids)
+    rnd.shuffle(shuffled_ids)
+    companies = ZipfSampler(shuffled_ids, zipf_s) if shuffled_ids else None
+
+    available = {k: w for k, w in mix.items() if w > 0}
+    if rubrics is None:
+        available.pop("rubric", None)
+    if companies is None:
+        available.pop("company", None)
+    names = list(available)
+    weights = [available[k] for k in names]
+
+    plan: list[tuple[str, str]] = []
+    for _ in range(n):
+        endpoint = rnd.choices(names, weights=weights, k=1)[0]
+        region = rnd.choice(REGIONS) if rnd.random() < region_rate else None
+        params: dict[str, Any] = {}
+        if endpoint == "search":
+            params["q"] = terms.sample(rnd)
+            if rnd.random() < 0.3:
+                params["q"] += " " + terms.sample(rnd)
+            path = "/api/biznes/search"
+        elif endpoint == "suggest":
+            term = terms.sample(rnd)
+            params["q"] = term[: rnd.randint(2, max(2, min(6, len(term))))]
+            path = "/api/biznes/suggest"
+        elif endpoint == "rubric":
+            params["slug"] = rubrics.sample(rnd)  # type: ignore[union-attr]
+            params["offset"] = rnd.choice([0, 0, 0, 24, 48])
+            path = "/api/biznes/rubric"
+        elif endpoint == "company":
+            path = f"/api/biznes/company/{quote(companies.sample(rnd), safe='')}"  # type: ignore[union-attr]
+        else:
+            path = "/api/biznes/catalog"
+        if region and endpoint != "company":
+            params["region"] = region
+        plan.append((endpoint, path + (f"?{urlencode(params)}" if params else "")))
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Sample:
+    endpoint: str
+    ms: float
+    status: int  # 0 = network error / timeout
+    nbytes: int
+
+
+def fetch(base_url: str, endpoint: str, path: str, timeout: float) -> Sample:
+    req = Request(base_url.rstrip("/") + path, headers={"Accept": "application/json", "User-Agent": "biznes-loadtest"})
+    start = time.perf_counter()
+    try:
+        with urlopen(req, timeout=timeout) as resp:
+            body = resp.read()
+            status = resp.status
+    except HTTPError as e:
+        body = e.read() or b""
+        status = e.code
+    except (URLError, OSError):
+        return Sample(endpoint, (time.perf_counter() - start) * 1000, 0, 0)
+    return Sample(endpoint, (time.perf_counter() - start) * 1000, status, len(body))
+
+
+def run_plan(
+    base_url: str, plan: list[tuple[str, str]], *, concurrency: int, timeout: float, duration: float
+) -> tuple[list[Sample], float]:
+    """
+    Executes the plan with `concurrency` workers; with `duration` > 0 the plan is cycled
+    until the deadline instead. Returns samples and wall-clock seconds.
+    """
+    counter = itertools.count()
+    deadline = time.monotonic() + duration if duration > 0 else 0.0
+
+    def worker() -> list[Sample]:
+        out: list[Sample] = []
+        while True:
+            i = next(counter)
+            if deadline:
+                if time.monotonic() >= deadline:
+                    break
+                endpoint, path = plan[i % len(plan)]
+            else:
+                if i >= len(plan):
+                    break
+                endpoint, path = plan[i]
+            out.append(fetch(base_url, endpoint, path, timeout))
+        return out
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        futures = [ex.submit(worker) for _ in range(concurrency)]
+        samples = [s for fut in futures for s in fut.result()]
+    return samples, time.perf_counter() - start
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), int(-(-pct * len(sorted_values) // 100))))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: Iterable[Sample], wall_s: float, cold_ms: dict[str, float]) -> dict[str, Any]:
+    by_endpoint: dict[str, list[Sample]] = defaultdict(list)
+    all_samples: list[Sample] = []
+    for s in samples:
+        by_endpoint[s.endpoint].append(s)
+        all_samples.append(s)
+
+    def stats(group: list[Sample]) -> dict[str, Any]:
+        ok = sorted(s.ms for s in group if 200 <= s.status < 400)
+        return {
+            "requests": len(group),
+            "ok": len(ok),
+            "client_errors": sum(1 for s in group if 400 <= s.status < 500),
+            "errors": sum(1 for s in group if s.status == 0 or s.status >= 500),
+            "p50_ms": round(percentile(ok, 50), 2),
+            "p95_ms": round(percentile(ok, 95), 2),
+            "p99_ms": round(percentile(ok, 99), 2),
+            "max_ms": round(ok[-1], 2) if ok else 0.0,
+            "rps": round(len(group) / wall_s, 2) if wall_s > 0 else 0.0,
+            "avg_bytes": int(sum(s.nbytes for s in group) / len(group)) if group else 0,
+        }
+
+    endpoints = {name: stats(by_endpoint[name]) for name, _ in ENDPOINTS if by_endpoint.get(name)}
+    for name, ms in cold_ms.items():
+        if name in endpoints:
+            endpoints[name]["cold_ms"] = round(ms, 2)
+    return {"wall_s": round(wall_s, 3), "overall": stats(all_samples), "endpoints": endpoints}
+
+
+def warm_up(base_url: str, plan: list[tuple[str, str]], *, n: int, timeout: float) -> dict[str, float]:
+    """
+    Sends the first request of each endpoint, then `n` more plan entries, sequentially.
+    Returns each endpoint's first (cold) latency, which includes store loading after a reload.
+    """
+    cold: dict[str, float] = {}
+    seen: set[str] = set()
+    for endpoint, path in plan:
+        if endpoint not in seen:
+            seen.add(endpoint)
+            cold[endpoint] = fetch(base_url, endpoint, path, timeout).ms
+    for endpoint, path in plan[:n]:
+        fetch(base_url, endpoint, path, timeout)
+    return cold
+
+
+def time_command(command: str) -> dict[str, Any]:
+    start = time.perf_counter()
+    proc = subprocess.run(command, shell=True)
+    return {"command": command, "seconds": round(time.perf_counter() - start, 3), "returncode": proc.returncode}
+
+
+# ---------------------------------------------------------------------------
+# Stub Meilisearch
+# ---------------------------------------------------------------------------
+
+
+def start_stub_meili(host: str, port: int, mode: str) -> ThreadingHTTPServer:
+    """
+    Minimal Meilisearch stand-in. `down`: /health returns 503, so API routes use their
+    in-memory fallback (the path that depends on the catalog build). `empty`: healthy,
+    every search returns no hits (isolates Next.js routing/serialization overhead).
+    Binds `host` (all interfaces by default) so a containerised app can reach it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _json(self, status: int, payload: dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.startswith("/health"):
+                if mode == "down":
+                    self._json(503, {"status": "unavailable"})
+                else:
+                    self._json(200, {"status": "available"})
+                return
+            self._json(404, {"message": "not found", "code": "not_found"})
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                query = json.loads(self.rfile.read(length) or b"{}").get("q", "")
+            except Exception:
+                query = ""
+            if mode != "down" and self.path.endswith("/search"):
+                self._json(200, {"hits": [], "query": query, "processingTimeMs": 0, "limit": 0, "offset": 0, "estimatedTotalHits": 0})
+                return
+            self._json(503, {"message": "stub", "code": "unavailable"})
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def run_title(result: dict[str, Any]) -> str:
+    if result["label"] == result["base_url"]:
+        return result["label"]
+    return f"{result['label']} ({result['base_url']})"
+
+
+def print_run(result: dict[str, Any]) -> None:
+    print(f"== {run_title(result)}: {result['wall_s']}s wall")
+    print(f"{'endpoint':<10} {'reqs':>7} {'err':>5} {'4xx':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8} {'cold':>8}")
+    rows = list(result["endpoints"].items()) + [("overall", result["overall"])]
+    for name, st in rows:
+        cold = st.get("cold_ms")
+        print(
+            f"{name:<10} {st['requests']:>7} {st['errors']:>5} {st['client_errors']:>5} "
+            f"{st['p50_ms']:>8.1f} {st['p95_ms']:>8.1f} {st['p99_ms']:>8.1f} {st['rps']:>8.1f} "
+            f"{(f'{cold:.1f}' if cold is not None else '-'):>8}"
+        )
+    if result.get("index"):
+        idx = result["index"]
+        print(f"index command: {idx['seconds']}s (exit {idx['returncode']})")
+
+
+def print_comparison(a: dict[str, Any], b: dict[str, Any]) -> None:
+    """
+    Side-by-side p50/p95/p99 and throughput per endpoint; deltas are B relative to A.
+    """
+
+    def delta(x: float, y: float) -> str:
+        if not x:
+            return "-"
+        return f"{(y - x) / x * 100:+.0f}%"
+
+    print(f"A = {run_title(a)}")
+    print(f"B = {run_title(b)}")
+    print(f"{'endpoint':<10} {'metric':<6} {'A':>9} {'B':>9} {'delta':>7}")
+    names = [n for n, _ in ENDPOINTS if n in a["endpoints"] or n in b["endpoints"]] + ["overall"]
+    for name in names:
+        sa = a["overall"] if name == "overall" else a["endpoints"].get(name, {})
+        sb = b["overall"] if name == "overall" else b["endpoints"].get(name, {})
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            x, y = float(sa.get(metric, 0)), float(sb.get(metric, 0))
+            print(f"{name:<10} {metric.replace('_ms', ''):<6} {x:>9.1f} {y:>9.1f} {delta(x, y):>7}")
+    for label, r in (("A", a), ("B", b)):
+        if r.get("index"):
+            print(f"index command {label}: {r['index']['seconds']}s")
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Replay search/catalog traffic against a Biznes stack and report latency")
+    p.add_argument("--base-url", action="append", default=[], help="Stack to test (repeat to run the same plan against several)")
+    p.add_argument("--label", action="append", default=[], help="Label per --base-url (defaults to the URL)")
+    p.add_argument("--query-log", default="", help="Replay this nginx access log / path-per-line file")
+    p.add_argument("--catalog", default="", help="Catalog companies.jsonl for a synthetic Zipfian query mix")
+    p.add_argument("--mix", default=DEFAULT_MIX, help=f"Endpoint weights for the synthetic mix (default: {DEFAULT_MIX})")
+    p.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent for term/rubric/company popularity")
+    p.add_argument("--region-rate", type=float, default=0.3, help="Share of synthetic requests with a region filter")
+    p.add_argument("--requests", type=int, default=2000, help="Plan size (synthetic) / max replayed requests (0 = whole log)")
+    p.add_argument("--duration", type=float, default=0, help="Cycle the plan for this many seconds instead")
+    p.add_argument("--concurrency", type=int, default=8, help="Parallel client workers")
+    p.add_argument("--warmup", type=int, default=50, help="Sequential warm-up requests before measuring")
+    p.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    p.add_argument("--seed", type=int, default=1, help="Random seed for the synthetic plan")
+    p.add_argument("--index-command", default="", help="Shell command to time before the run (e.g. Meilisearch indexing)")
+    p.add_argument("--stub-meili", type=int, default=0, metavar="PORT", help="Serve a stub Meilisearch on PORT")
+    p.add_argument(
+        "--stub-meili-host",
+        default="0.0.0.0",
+        help="Address the stub binds (default: all interfaces, reachable from the Docker bridge network)",
+    )
+    p.add_argument("--stub-meili-mode", choices=["down", "empty"], default="down", help="Stub behaviour (see docstring)")
+    p.add_argument("--save", default="", help="Write results JSON here (one object per --base-url)")
+    p.add_argument("--compare", nargs=2, metavar=("A", "B"), help="Compare two saved result files and exit")
+    args = p.parse_args()
+
+    if args.compare:
+        runs = []
+        for path in args.compare:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            runs.append(data[0] if isinstance(data, list) else data)
+        print_comparison(runs[0], runs[1])
+        return 0
+
+    if not args.base_url:
+        p.error("--base-url is required (or use --compare)")
+    if bool(args.query_log) == bool(args.catalog):
+        p.error("give exactly one of --query-log or --catalog")
+
+    if args.query_log:
+        plan = load_query_log(Path(args.query_log))
+        if args.requests > 0:
+            plan = plan[: args.requests]
+        plan_info: dict[str, Any] = {"source": "query_log", "path": args.query_log, "requests": len(plan)}
+    else:
+        try:
+            mix = parse_mix(args.mix)
+        except ValueError as e:
+            p.error(str(e))
+        vocab = load_catalog_vocabulary(Path(args.catalog))
+        plan = synthetic_plan(
+            vocab,
+            n=max(1, args.requests),
+            mix=mix,
+            zipf_s=args.zipf_s,
+            region_rate=args.region_rate,
+            seed=args.seed,
+        )
+        plan_info = {
+            "source": "synthetic",
+            "catalog": args.catalog,
+            "requests": len(plan),
+            "mix": mix,
+            "zipf_s": args.zipf_s,
+            "seed": args.seed,
+        }
+    if not plan:
+        p.error("request plan is empty")
+    print(f"Plan: {len(plan)} requests, endpoints: {dict(Counter(e for e, _ in plan))}")
+
+    stub = start_stub_meili(args.stub_meili_host, args.stub_meili, args.stub_meili_mode) if args.stub_meili else None
+    try:
+        results: list[dict[str, Any]] = []
+        for i, base_url in enumerate(args.base_url):
+            label = args.label[i] if i < len(args.label) else base_url
+            index = time_command(args.index_command) if args.index_command else None
+            cold = warm_up(base_url, plan, n=args.warmup, timeout=args.timeout)
+            samples, wall_s = run_plan(
+                base_url, plan, concurrency=max(1, args.concurrency), timeout=args.timeout, duration=args.duration
+            )
+            result = {
+                "label": label,
+                "base_url": base_url,
+                "started_at": now_utc_compact(),
+                "concurrency": args.concurrency,
+                "plan": plan_info,
+                "index": index,
+                **summarize(samples, wall_s, cold),
+            }
+            print_run(result)
+            results.append(result)
+    finally:
+        if stub is not None:
+            stub.shutdown()
+
+    if len(results) >= 2:
+        print_comparison(results[0], results[1])
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Wrote: {args.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
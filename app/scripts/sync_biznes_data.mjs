@@ -19,6 +19,24 @@ if (!fs.existsSync(src)) {
   process.exit(1);
 }
 
+// With import generations (`--keep-generations`), companies.jsonl is a symlink into the live
+// generation; copying through it would rewrite that generation in place.
+if (fs.lstatSync(dst, { throwIfNoEntry: false })?.isSymbolicLink()) {
+  console.error(`${dst} is published through import generations; publish with import_info_db_into_biznes.py instead`);
+  process.exit(1);
+}
+
 fs.mkdirSync(path.dirname(dst), { recursive: true });
-fs.copyFileSync(src, dst);
+const tmp = `${dst}.tmp`;
+fs.copyFileSync(src, tmp);
+fs.renameSync(tmp, dst);
 console.log(`Copied: ${src} -> ${dst}`);
+
+// Importer sidecars describe the previous JSONL; drop them rather than serve stale indexes.
+for (const name of ["companies.postings.bin", "companies.facets.json", "companies.geo.json"]) {
+  const sidecar = path.join(path.dirname(dst), name);
+  if (fs.existsSync(sidecar)) {
+    fs.unlinkSync(sidecar);
+    console.log(`Removed stale: ${sidecar}`);
+  }
+}